@@ -1,12 +1,362 @@
 import os
+import re
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QFileDialog, QLabel, QMessageBox
+import json
+import time
+import datetime
+import threading
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
+                             QLabel, QMessageBox, QCheckBox, QSpinBox)
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Fișierul de configurare (în folderul curent) cu extensiile păstrate
+CONFIG_FILE = "deleteinutile_config.json"
+# Extensiile păstrate dacă fișierul de configurare lipsește (comparația nu ține cont de litere mari/mici)
+DEFAULT_KEEP_EXTENSIONS = [".doc", ".docx"]
+# Lista fișierelor șterse, scrisă pe disc pe măsură ce rularea avansează (un obiect JSON pe linie);
+# se creează lângă folderul ales, ca "<nume folder>.deleteinutile_manifest.jsonl"
+MANIFEST_FILE = "deleteinutile_manifest.jsonl"
+# Numărul de fișiere șterse într-un lot; anularea este verificată între loturi
+DELETE_BATCH_SIZE = 500
+# Intervalul (secunde) la care se trimit numărătorile către interfață
+PROGRESS_INTERVAL = 0.25
+# Folderul (în interiorul folderului ales) în care modul carantină mută fișierele; scanarea îl ignoră
+QUARANTINE_DIR = ".carantina_stergere"
+# Fiecare rulare în carantină primește un subfolder cu momentul pornirii
+QUARANTINE_BATCH_FORMAT = "%Y%m%d-%H%M%S-%f"
+# Numărul implicit de zile după care curățarea din fundal șterge definitiv o rulare din carantină
+DEFAULT_RETENTION_DAYS = 30
+# Curățarea din fundal face o pauză după fiecare grup de intrări (în locul unei priorități I/O scăzute)
+PURGE_CHUNK = 200
+PURGE_PAUSE = 0.05
+
+def load_keep_extensions(path=CONFIG_FILE):
+    """Citește extensiile păstrate; dacă fișierul lipsește, îl creează cu valorile implicite."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            extensions = json.load(f).get('extensii_pastrate', DEFAULT_KEEP_EXTENSIONS)
+        if isinstance(extensions, list) and all(isinstance(ext, str) for ext in extensions):
+            return list(extensions)
+        print(f"Configurare invalidă în {path}: 'extensii_pastrate' trebuie să fie o listă de texte")
+    except FileNotFoundError:
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'extensii_pastrate': DEFAULT_KEEP_EXTENSIONS}, f, ensure_ascii=False, indent=2)
+        except OSError:
+            pass
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        print(f"Eroare la citirea configurării {path}: {e}")
+    return list(DEFAULT_KEEP_EXTENSIONS)
+
+def compile_whitelist(extensions):
+    """
+    O singură expresie regulată pentru toate extensiile păstrate, fără diferență între
+    litere mari și mici (.DOC este păstrat). Returnează None dacă lista este goală.
+    """
+    names = sorted({ext.strip().lstrip('.').lower() for ext in extensions} - {''}, key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile(r'\.(?:' + '|'.join(re.escape(name) for name in names) + r')\Z', re.IGNORECASE)
+
+def is_kept(whitelist, name):
+    return whitelist.search(name) is not None
+
+def list_folder(path, exclude=(), on_error=None):
+    """
+    Listează un singur folder prin os.scandir. Returnează (fișiere, subfoldere, listat_complet);
+    listat_complet este False dacă listarea a eșuat sau folderul conține legături către foldere,
+    care (ca la os.walk) nu sunt nici parcurse, nici șterse. Erorile merg la on_error(cale, eroare).
+    """
+    files = []
+    subdirs = []
+    whole = True
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    is_dir_link = not is_dir and entry.is_symlink() and entry.is_dir()
+                except OSError:
+                    is_dir = is_dir_link = False
+                if is_dir:
+                    if entry.path not in exclude:
+                        subdirs.append(entry.path)
+                elif is_dir_link:
+                    whole = False
+                else:
+                    files.append(entry)
+    except OSError as e:
+        whole = False
+        if on_error:
+            on_error(path, e)
+        else:
+            print(f"Eroare la citirea folderului {path}: {e}")
+    return files, subdirs, whole
+
+def iter_files(folder_path, exclude=(), on_error=None):
+    """
+    Generator cu fișierele din arbore, listate folder cu folder; nu păstrează listări întregi
+    în memorie. Folderele din `exclude` (carantina) nu sunt parcurse.
+    """
+    pending = [folder_path]
+    while pending:
+        files, subdirs, _ = list_folder(pending.pop(), exclude, on_error)
+        pending.extend(subdirs)
+        yield from files
+
+def iter_folders_bottom_up(folder_path, exclude=(), on_error=None):
+    """
+    Aceeași parcurgere, dar fiecare folder este produs după tot subarborele lui, ca
+    (cale, fișiere, listat_complet). În memorie stau doar folderele de pe drumul curent.
+    """
+    stack = [(folder_path, *list_folder(folder_path, exclude, on_error))]
+    while stack:
+        path, files, subdirs, whole = stack[-1]
+        if subdirs:
+            child = subdirs.pop()
+            stack.append((child, *list_folder(child, exclude, on_error)))
+            continue
+        stack.pop()
+        yield path, files, whole
+
+def quarantine_path(folder_path):
+    return os.path.join(folder_path, QUARANTINE_DIR)
+
+def manifest_path_for(folder_path):
+    """
+    Manifestul stă lângă folderul ales, nu în folderul curent și nici în interiorul folderului
+    (unde ar fi șters chiar de rulare). Pentru rădăcina unui disc se folosește folderul curent.
+    """
+    folder_path = os.path.normpath(os.path.abspath(folder_path))
+    parent, name = os.path.split(folder_path)
+    if not name:
+        return os.path.abspath(MANIFEST_FILE)
+    return os.path.join(parent, f"{name}.{MANIFEST_FILE}")
+
+def recreate_folders(moved_root, original_root):
+    """
+    Recreează goală structura de foldere a unui subfolder mutat întreg, ca arborele rămas
+    să arate la fel ca după ștergere (modul normal șterge doar fișiere, nu și foldere).
+    """
+    for root, _, _ in os.walk(moved_root):
+        os.makedirs(os.path.join(original_root, os.path.relpath(root, moved_root)), exist_ok=True)
+
+def throttled_rmtree(path, cancel_event=None):
+    """Șterge un arbore de jos în sus, cu pauze regulate ca să nu încarce discul."""
+    removed = 0
+    for root, dirs, files in os.walk(path, topdown=False):
+        dir_names = set(dirs)
+        for name in files + dirs:
+            entry_path = os.path.join(root, name)
+            try:
+                if name in dir_names and not os.path.islink(entry_path):
+                    os.rmdir(entry_path)
+                else:
+                    os.remove(entry_path)
+            except OSError:
+                pass
+            removed += 1
+            if removed % PURGE_CHUNK == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                time.sleep(PURGE_PAUSE)
+    try:
+        os.rmdir(path)
+    except OSError:
+        return False
+    return True
+
+def purge_quarantine(folder_path, retention_days, cancel_event=None, now=None):
+    """Șterge definitiv rulările din carantină mai vechi de retention_days; returnează câte au fost șterse."""
+    root = quarantine_path(folder_path)
+    if not os.path.isdir(root):
+        return 0
+    limit = (now or datetime.datetime.now()) - datetime.timedelta(days=retention_days)
+    removed = 0
+    for name in sorted(os.listdir(root)):
+        try:
+            created = datetime.datetime.strptime(name, QUARANTINE_BATCH_FORMAT)
+        except ValueError:
+            continue
+        if created > limit:
+            continue
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        if throttled_rmtree(os.path.join(root, name), cancel_event):
+            removed += 1
+    return removed
+
+class PurgeWorker(QThread):
+    """Curățarea carantinei pe un fir separat, cu pauze, ca să nu deranjeze lucrul curent."""
+    finished = pyqtSignal(int)  # numărul de rulări șterse definitiv
+
+    def __init__(self, folder_path, retention_days):
+        super().__init__()
+        self.folder_path = folder_path
+        self.retention_days = retention_days
+        self.cancel_event = threading.Event()
+
+    def stop(self):
+        self.cancel_event.set()
+
+    def run(self):
+        self.finished.emit(purge_quarantine(self.folder_path, self.retention_days, self.cancel_event))
+
+class CleanerWorker(QThread):
+    """
+    Ștergerea pe un fir separat: fișierele vin din iter_files și sunt șterse în loturi.
+    Fiecare lot este adăugat în manifest și scris pe disc, deci rezultatele nu se adună în memorie.
+    """
+    progress = pyqtSignal(int, int, int)  # fișiere verificate, șterse (mutate), erori
+    finished = pyqtSignal(dict)           # numărătorile finale, inclusiv 'cancelled'
+
+    def __init__(self, folder_path, whitelist, quarantine=False, manifest_path=None):
+        super().__init__()
+        self.folder_path = folder_path
+        self.whitelist = whitelist
+        self.quarantine = quarantine
+        self.manifest_path = manifest_path or manifest_path_for(folder_path)
+        self.is_running = True
+        self.last_progress = 0.0
+        self.stats = {'scanned': 0, 'deleted': 0, 'errors': 0, 'cancelled': False,
+                      'manifest': os.path.abspath(self.manifest_path), 'manifest_error': None}
+        self.manifest = None
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        try:
+            self.manifest = open(self.manifest_path, 'w', encoding='utf-8')
+        except OSError as e:
+            # Fără manifest nu se șterge nimic: rularea s-ar face fără nicio evidență
+            print(f"Eroare la crearea manifestului {self.manifest_path}: {e}")
+            self.stats['manifest_error'] = str(e)
+        else:
+            with self.manifest:
+                if self.quarantine:
+                    self.quarantine_non_doc_files()
+                else:
+                    self.delete_non_doc_files()
+        self.manifest = None
+        self.stats['cancelled'] = not self.is_running
+        self.report_progress(force=True)
+        self.finished.emit(self.stats)
+
+    def delete_non_doc_files(self):
+        batch = []
+        for entry in iter_files(self.folder_path, {quarantine_path(self.folder_path)}, self.record_error):
+            if not self.is_running:
+                break
+            self.stats['scanned'] += 1
+            if not is_kept(self.whitelist, entry.name):
+                batch.append(entry.path)
+                if len(batch) >= DELETE_BATCH_SIZE:
+                    self.delete_batch(batch)
+                    batch = []
+            self.report_progress()
+        # Un lot început înainte de anulare nu mai este șters
+        if self.is_running:
+            self.delete_batch(batch)
+
+    def delete_batch(self, batch):
+        for file_path in batch:
+            try:
+                os.remove(file_path)  # Șterge fișierul
+                self.stats['deleted'] += 1
+                self.write_record({'path': file_path})
+            except OSError as e:
+                self.record_error(file_path, e)
+        self.manifest.flush()
+
+    def quarantine_non_doc_files(self):
+        """
+        Mută în carantină (pe același volum) tot ce nu are o extensie păstrată. Folderele vin de
+        jos în sus din iter_folders_bottom_up; un folder este complet dacă a fost listat fără
+        erori, nu conține fișiere păstrate și toate subfolderele lui sunt complete. Un folder
+        complet este mutat întreg, cu o singură redenumire, de primul părinte incomplet, apoi
+        structura lui este recreată goală; din folderele incomplete se mută fișier cu fișier.
+        """
+        batch_root = os.path.join(quarantine_path(self.folder_path),
+                                  datetime.datetime.now().strftime(QUARANTINE_BATCH_FORMAT))
+        self.stats.update(renames=0, quarantine=batch_root)
+        # Pentru folderele de pe drumul curent: subfolderele complete (cale, fișiere) care așteaptă decizia
+        complete_children = {}
+        # Folderele de pe drumul curent care au cel puțin un subfolder incomplet
+        incomplete = set()
+        for path, files, whole in iter_folders_bottom_up(
+                self.folder_path, {quarantine_path(self.folder_path)}, self.record_error):
+            if not self.is_running:
+                break
+            self.stats['scanned'] += len(files)
+            children = complete_children.pop(path, [])
+            has_incomplete_child = path in incomplete
+            incomplete.discard(path)
+            if path == self.folder_path:
+                parent = None
+            else:
+                parent = os.path.dirname(path)
+                if (whole and not has_incomplete_child
+                        and not any(is_kept(self.whitelist, entry.name) for entry in files)):
+                    count = len(files) + sum(child_count for _, child_count in children)
+                    complete_children.setdefault(parent, []).append((path, count))
+                    continue
+                incomplete.add(parent)
+
+            for child, count in children:
+                if not self.is_running:
+                    break
+                if count:  # un subarbore fără fișiere rămâne oricum la fel
+                    self.move_to_quarantine(child, count, batch_root, folder=True)
+            for entry in files:
+                if not self.is_running:
+                    break
+                if not is_kept(self.whitelist, entry.name):
+                    self.move_to_quarantine(entry.path, 1, batch_root)
+            self.manifest.flush()
+            self.report_progress()
+
+    def move_to_quarantine(self, source, count, batch_root, folder=False):
+        target = os.path.join(batch_root, os.path.relpath(source, self.folder_path))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(source, target)
+        except OSError as e:
+            self.record_error(source, e)
+            return
+        self.stats['deleted'] += count
+        self.stats['renames'] += 1
+        record = {'path': source, 'quarantine': target}
+        if folder:
+            record['files'] = count
+            try:
+                recreate_folders(target, source)
+            except OSError as e:
+                self.stats['errors'] += 1
+                record['error'] = str(e)
+        self.write_record(record)
+
+    def record_error(self, path, error):
+        """Erorile (inclusiv folderele care nu pot fi listate) sunt numărate și trecute în manifest."""
+        self.stats['errors'] += 1
+        self.write_record({'path': path, 'error': str(error)})
+
+    def write_record(self, record):
+        self.manifest.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def report_progress(self, force=False):
+        now = time.monotonic()
+        if force or now - self.last_progress >= PROGRESS_INTERVAL:
+            self.last_progress = now
+            self.progress.emit(self.stats['scanned'], self.stats['deleted'], self.stats['errors'])
 
 class FileCleanerApp(QWidget):
     def __init__(self):
         super().__init__()
+        self.purge_worker = None
+        self.worker = None
         self.initUI()
-        
+    
     def initUI(self):
         self.setWindowTitle("Ștergere fișiere non-DOC")
         self.setGeometry(100, 100, 400, 200)
@@ -22,18 +372,54 @@ class FileCleanerApp(QWidget):
         browse_button.clicked.connect(self.browse_folder)
         layout.addWidget(browse_button)
         
+        # Modul carantină
+        self.quarantine_checkbox = QCheckBox(
+            f"Mută în carantină în loc de ștergere (rapid, reversibil; folderul {QUARANTINE_DIR})")
+        layout.addWidget(self.quarantine_checkbox)
+        retention_layout = QHBoxLayout()
+        retention_layout.addWidget(QLabel("Păstrează carantina (zile):"))
+        self.retention_spin = QSpinBox()
+        # Cel puțin o zi: curățarea pornește imediat după rulare și nu trebuie să șteargă rularea abia mutată
+        self.retention_spin.setRange(1, 3650)
+        self.retention_spin.setValue(DEFAULT_RETENTION_DAYS)
+        retention_layout.addWidget(self.retention_spin)
+        retention_layout.addStretch()
+        layout.addLayout(retention_layout)
+        
         # Buton Start
-        start_button = QPushButton("Start", self)
-        start_button.clicked.connect(self.delete_non_doc_files)
-        layout.addWidget(start_button)
+        self.start_button = QPushButton("Start", self)
+        self.start_button.clicked.connect(self.delete_non_doc_files)
+        layout.addWidget(self.start_button)
         
-        self.setLayout(layout)
+        # Buton Anulare
+        self.cancel_button = QPushButton("Anulează", self)
+        self.cancel_button.clicked.connect(self.cancel_cleaning)
+        self.cancel_button.setEnabled(False)
+        layout.addWidget(self.cancel_button)
+        
+        # Numărătorile în timpul rulării
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
         
+        self.setLayout(layout)
+    
     def browse_folder(self):
         # Deschide dialogul de selectare a folderului
         folder_path = QFileDialog.getExistingDirectory(self, "Selectează folder")
         if folder_path:
             self.folder_path_label.setText(folder_path)
+            self.start_purge(folder_path)
+    
+    def start_purge(self, folder_path):
+        """Pornește în fundal ștergerea rulărilor expirate din carantină, dacă există."""
+        if self.purge_worker or not os.path.isdir(quarantine_path(folder_path)):
+            return
+        self.purge_worker = PurgeWorker(folder_path, self.retention_spin.value())
+        self.purge_worker.finished.connect(self.purge_finished)
+        self.purge_worker.start()
+    
+    def purge_finished(self, removed):
+        self.purge_worker = None
     
     def delete_non_doc_files(self):
         folder_path = self.folder_path_label.text()
@@ -42,25 +428,67 @@ class FileCleanerApp(QWidget):
             QMessageBox.warning(self, "Atenție", "Selectați un folder.")
             return
         
-        deleted_files_count = 0
+        whitelist = compile_whitelist(load_keep_extensions())
+        if whitelist is None:
+            QMessageBox.warning(self, "Atenție", f"Lista de extensii păstrate din {CONFIG_FILE} este goală.")
+            return
         
-        # Parcurge toate fișierele și subfolderele din folderul selectat
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                # Verifică extensia fișierului
-                if not (file.endswith('.doc') or file.endswith('.docx')):
-                    try:
-                        file_path = os.path.join(root, file)
-                        os.remove(file_path)  # Șterge fișierul
-                        deleted_files_count += 1
-                    except Exception as e:
-                        print(f"Eroare la ștergerea fișierului {file_path}: {e}")
+        self.worker = CleanerWorker(folder_path, whitelist, self.quarantine_checkbox.isChecked())
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.cleaning_finished)
+        self.start_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.status_label.setText("Se mută în carantină..." if self.worker.quarantine else "Se șterge...")
+        self.worker.start()
+    
+    def cancel_cleaning(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.cancel_button.setEnabled(False)
+    
+    def update_progress(self, scanned, deleted, errors):
+        action = "mutate" if self.worker and self.worker.quarantine else "șterse"
+        self.status_label.setText(f"Verificate: {scanned}, {action}: {deleted}, erori: {errors}")
+    
+    def cleaning_finished(self, stats):
+        worker, self.worker = self.worker, None
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        if stats['manifest_error']:
+            QMessageBox.critical(
+                self, "Eroare",
+                f"Nu s-a putut crea lista fișierelor {stats['manifest']}:\n{stats['manifest_error']}\n"
+                f"Nu a fost șters niciun fișier.")
+            return
+        title = "Anulat" if stats['cancelled'] else "Finalizat"
+        if worker.quarantine:
+            QMessageBox.information(
+                self, title,
+                f"{stats['deleted']} fișiere au fost mutate în carantină "
+                f"({stats['renames']} redenumiri, {stats['errors']} erori).\n"
+                f"Carantina: {stats['quarantine']}\n"
+                f"Va fi ștearsă automat după {self.retention_spin.value()} zile.\n"
+                f"Lista mutărilor: {stats['manifest']}")
+            self.start_purge(worker.folder_path)
+            return
         
         # Mesaj de informare cu numărul de fișiere șterse
-        QMessageBox.information(self, "Finalizat", f"{deleted_files_count} fișiere au fost șterse.")
+        QMessageBox.information(
+            self, title,
+            f"{stats['deleted']} fișiere au fost șterse ({stats['errors']} erori, "
+            f"{stats['scanned']} fișiere verificate).\n"
+            f"Lista fișierelor șterse: {stats['manifest']}")
+    
+    def closeEvent(self, event):
+        for worker in (self.worker, self.purge_worker):
+            if worker:
+                worker.stop()
+                worker.wait()
+        event.accept()
 
-# Inițializează aplicația
-app = QApplication(sys.argv)
-window = FileCleanerApp()
-window.show()
-sys.exit(app.exec_())
\ No newline at end of file
+if __name__ == '__main__':
+    # Inițializează aplicația
+    app = QApplication(sys.argv)
+    window = FileCleanerApp()
+    window.show()
+    sys.exit(app.exec_())
@@ -0,0 +1,205 @@
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+import folderdate
+
+# Configurațiile rulate implicit: (lățime, adâncime, fișiere per folder)
+DEFAULT_CASES = [(4, 4, 10), (8, 4, 20), (10, 5, 10)]
+# Cât poate crește timpul față de referință înainte să fie raportat ca regresie
+DEFAULT_TOLERANCE = 0.25
+
+class CountingEntry:
+    """Înveliș peste os.DirEntry care numără apelurile stat()."""
+    __slots__ = ('entry', 'counter')
+
+    def __init__(self, entry, counter):
+        self.entry = entry
+        self.counter = counter
+
+    def stat(self, *args, **kwargs):
+        self.counter['stat'] += 1
+        return self.entry.stat(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.entry, name)
+
+class CountingScandir:
+    """Înveliș peste iteratorul os.scandir (inclusiv ca context manager)."""
+    def __init__(self, iterator, counter):
+        self.iterator = iterator
+        self.counter = counter
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.iterator.close()
+
+    def __iter__(self):
+        for entry in self.iterator:
+            yield CountingEntry(entry, self.counter)
+
+class CountingOs:
+    """Înlocuiește modulul os din folderdate și numără apelurile către sistemul de fișiere."""
+    def __init__(self):
+        self.counter = {'scandir': 0, 'stat': 0, 'utime': 0}
+
+    def scandir(self, path):
+        self.counter['scandir'] += 1
+        return CountingScandir(os.scandir(path), self.counter)
+
+    def stat(self, *args, **kwargs):
+        self.counter['stat'] += 1
+        return os.stat(*args, **kwargs)
+
+    def utime(self, *args, **kwargs):
+        self.counter['utime'] += 1
+        return os.utime(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(os, name)
+
+def generate_tree(root, width, depth, files, seed=0):
+    """
+    Generează un arbore sintetic: fiecare folder are `width` subfoldere până la adâncimea
+    `depth` și `files` fișiere goale cu date aleatoare. Returnează (foldere, fișiere).
+    """
+    rnd = random.Random(seed)
+    folders_count = 0
+    files_count = 0
+    pending = [(root, 0)]
+    while pending:
+        path, level = pending.pop()
+        os.makedirs(path, exist_ok=True)
+        folders_count += 1
+        for index in range(files):
+            file_path = os.path.join(path, f"fisier_{index}.doc")
+            os.close(os.open(file_path, os.O_CREAT | os.O_WRONLY))
+            file_time = rnd.uniform(946684800, 1700000000)
+            os.utime(file_path, (file_time, file_time))
+            files_count += 1
+        if level < depth:
+            for index in range(width):
+                pending.append((os.path.join(path, f"folder_{index}"), level + 1))
+    return folders_count, files_count
+
+def reset_folder_times(root):
+    """Readuce data tuturor folderelor la momentul curent, ca fiecare rulare să aibă de lucru."""
+    for path, _, _ in os.walk(root):
+        os.utime(path, None)
+
+def run_engine(root, scan_workers, apply_workers, snapshot_file):
+    worker = folderdate.WorkerThread(root, True, apply_workers, False, snapshot_file,
+                                     scan_workers=scan_workers)
+    worker.run()
+    return worker.stats
+
+def benchmark_case(base_dir, width, depth, files, scan_workers, apply_workers, keep=False):
+    root = os.path.join(base_dir, f"arbore_{width}x{depth}x{files}")
+    snapshot_file = os.path.join(base_dir, "snapshot.json")
+    shutil.rmtree(root, ignore_errors=True)
+    folders_count, files_count = generate_tree(root, width, depth, files)
+
+    # Rularea cronometrată, fără instrumentare
+    start_time = time.perf_counter()
+    stats = run_engine(root, scan_workers, apply_workers, snapshot_file)
+    wall_time = time.perf_counter() - start_time
+
+    # Rularea instrumentată: apeluri către sistemul de fișiere și memoria de vârf
+    reset_folder_times(root)
+    counting_os = CountingOs()
+    folderdate.os = counting_os
+    tracemalloc.start()
+    try:
+        run_engine(root, scan_workers, apply_workers, snapshot_file)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        folderdate.os = os
+
+    if not keep:
+        shutil.rmtree(root, ignore_errors=True)
+    calls = counting_os.counter
+    return {
+        'case': f"{width}x{depth}x{files}",
+        'folders': folders_count,
+        'files': files_count,
+        'wall_seconds': round(wall_time, 3),
+        'files_per_second': round(files_count / wall_time) if wall_time else None,
+        'calls': dict(calls),
+        'calls_per_file': round(sum(calls.values()) / max(files_count, 1), 3),
+        'peak_memory_mb': round(peak_memory / (1024 * 1024), 2),
+        'updated': stats['updated'],
+        'errors': stats['errors'],
+    }
+
+def find_regressions(results, baseline, tolerance):
+    """Compară rezultatele cu o rulare anterioară salvată și returnează lista regresiilor."""
+    previous = {item['case']: item for item in baseline}
+    regressions = []
+    for item in results:
+        old = previous.get(item['case'])
+        if not old:
+            continue
+        if item['wall_seconds'] > old['wall_seconds'] * (1 + tolerance):
+            regressions.append(f"{item['case']}: timp {old['wall_seconds']}s -> {item['wall_seconds']}s")
+        if item['calls_per_file'] > old['calls_per_file']:
+            regressions.append(f"{item['case']}: apeluri/fișier {old['calls_per_file']} -> {item['calls_per_file']}")
+        if item['peak_memory_mb'] > old['peak_memory_mb'] * (1 + tolerance):
+            regressions.append(f"{item['case']}: memorie {old['peak_memory_mb']}MB -> {item['peak_memory_mb']}MB")
+    return regressions
+
+def parse_case(text):
+    width, depth, files = (int(part) for part in text.lower().split('x'))
+    return width, depth, files
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark pentru motorul de agregare din folderdate.py pe arbori sintetici.")
+    parser.add_argument('--case', action='append', type=parse_case,
+                        help="configurație LĂȚIMExADÂNCIMExFIȘIERE (se poate repeta), ex. 10x5x20")
+    parser.add_argument('--scan-workers', type=int, default=folderdate.DEFAULT_SCAN_WORKERS)
+    parser.add_argument('--apply-workers', type=int, default=folderdate.DEFAULT_APPLY_WORKERS)
+    parser.add_argument('--dir', help="folderul în care se generează arborii (implicit: temporar)")
+    parser.add_argument('--keep', action='store_true', help="nu șterge arborii generați")
+    parser.add_argument('--output', help="salvează rezultatele JSON în acest fișier")
+    parser.add_argument('--baseline', help="rezultate JSON anterioare pentru detectarea regresiilor")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    base_dir = args.dir or tempfile.mkdtemp(prefix="folderdate_bench_")
+    os.makedirs(base_dir, exist_ok=True)
+    results = []
+    try:
+        for width, depth, files in args.case or DEFAULT_CASES:
+            result = benchmark_case(base_dir, width, depth, files,
+                                    args.scan_workers, args.apply_workers, args.keep)
+            results.append(result)
+            print(f"{result['case']:>12}: {result['files']} fișiere, {result['folders']} foldere, "
+                  f"{result['wall_seconds']}s, {result['calls_per_file']} apeluri/fișier, "
+                  f"{result['peak_memory_mb']} MB")
+    finally:
+        if not args.dir and not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESIE: {message}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,118 +1,558 @@
 import sys
 import os
+import json
+import argparse
+import time
+import queue
 import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, 
                            QVBoxLayout, QWidget, QFileDialog, QLabel,
-                           QProgressBar, QTextEdit, QComboBox, QHBoxLayout)
-from PyQt5.QtCore import QThread, pyqtSignal
+                           QProgressBar, QListView, QComboBox, QHBoxLayout,
+                           QSpinBox, QCheckBox)
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QAbstractListModel, QModelIndex
 
 logging.basicConfig(level=logging.DEBUG,
                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# Logul complet merge doar în fișier (vezi start_file_log), nu și în consolă
+logger.propagate = False
+logger.addHandler(logging.NullHandler())
+
+# Diferența maximă (secunde) sub care data folderului este considerată deja corectă
+MTIME_TOLERANCE = 1e-6
+# Numărul implicit de fire pentru apelurile os.utime (util pe share-uri SMB)
+DEFAULT_APPLY_WORKERS = 8
+# Numărul implicit de fire care listează subarborii în paralel (1 = scanare pe un singur fir)
+DEFAULT_SCAN_WORKERS = 4
+# Fișierul în care se păstrează snapshot-ul folderelor între rulări
+SNAPSHOT_FILE = "folderdate_snapshot.json"
+# Fișierul cu logul complet al ultimei rulări
+LOG_FILE = "folderdate_log.txt"
+# Intervalul (secunde) la care firul de lucru trimite loturile de mesaje către interfață
+LOG_FLUSH_INTERVAL = 0.25
+# Numărul maxim de linii păstrate în fereastra de log
+LOG_VIEW_LINES = 5000
+# Nivelurile de detaliu disponibile în interfață
+LOG_LEVELS = [("Normal", logging.INFO), ("Detaliat (fiecare fișier)", logging.DEBUG)]
+
+def start_file_log(path=LOG_FILE):
+    """
+    Pornește scrierea logului complet în fișier pe un fir separat (QueueListener),
+    astfel încât firul de lucru doar pune mesajele într-o coadă.
+    """
+    file_handler = logging.FileHandler(path, mode='w', encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    log_queue = queue.Queue()
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    return listener, queue_handler
+
+def stop_file_log(file_log):
+    """Oprește scrierea în fișier după ce toate mesajele din coadă au fost scrise."""
+    listener, queue_handler = file_log
+    logger.removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+def file_log_active():
+    """True dacă logul complet este scris într-un fișier (start_file_log a fost apelată)."""
+    return any(not isinstance(handler, logging.NullHandler) for handler in logger.handlers)
+
+class LogBuffer:
+    """
+    Buffer de log în firul de lucru: toate mesajele sunt trimise în fișier prin logger, iar cele
+    de la nivelul ales în interfață sunt livrate ferestrei în loturi, de câteva ori pe secundă.
+    """
+    def __init__(self, emit_batch, interval=LOG_FLUSH_INTERVAL, level=logging.INFO):
+        self.emit_batch = emit_batch
+        self.interval = interval
+        self.level = level
+        self.lock = threading.Lock()
+        self.pending = []
+        self.last_flush = time.monotonic()
+
+    def enabled(self, level):
+        """True dacă un mesaj de acest nivel ajunge în interfață sau în fișierul de log."""
+        return level >= self.level or (file_log_active() and logger.isEnabledFor(level))
+
+    def add(self, level, message):
+        logger.log(level, message)
+        # Nivelul ales în interfață filtrează doar ce ajunge în fereastra de log
+        if level < self.level:
+            return
+        with self.lock:
+            self.pending.append(message)
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+            self.last_flush = time.monotonic()
+        if batch:
+            self.emit_batch(batch)
+
+class LogModel(QAbstractListModel):
+    """Model circular pentru fereastra de log: păstrează doar ultimele max_lines linii."""
+    def __init__(self, max_lines=LOG_VIEW_LINES, parent=None):
+        super().__init__(parent)
+        self.lines = deque(maxlen=max_lines)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.lines[index.row()]
+        return None
+
+    def append_lines(self, lines):
+        """
+        Adaugă liniile noi cu notificări de inserare; cele mai vechi, peste limită, sunt scoase
+        cu notificări de ștergere, deci view-ul își păstrează poziția și selecția.
+        """
+        lines = list(lines)[-self.lines.maxlen:]
+        if not lines:
+            return
+        overflow = len(self.lines) + len(lines) - self.lines.maxlen
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.lines.popleft()
+            self.endRemoveRows()
+        first = len(self.lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        self.lines.extend(lines)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.lines.clear()
+        self.endResetModel()
+
+class FolderInfo:
+    """Datele agregate ale unui folder: data proprie și extremele din substructură."""
+    __slots__ = ('path', 'depth', 'mtime', 'parent', 'children', 'subdirs', 'file_count', 'own',
+                 'oldest_time', 'oldest_file', 'newest_time', 'newest_file', 'cached', 'dirty')
+
+    def __init__(self, path, depth, mtime, parent=None):
+        self.path = path
+        self.depth = depth
+        self.mtime = mtime
+        self.parent = parent
+        self.children = []
+        self.subdirs = []
+        self.file_count = 0
+        # Extremele fișierelor aflate direct în folder: (timp_vechi, nume, timp_nou, nume)
+        self.own = (None, None, None, None)
+        self.oldest_time = None
+        self.oldest_file = None
+        self.newest_time = None
+        self.newest_file = None
+        # Extremele întregului subarbore din snapshot, valabile doar dacă nimic de dedesubt nu s-a schimbat
+        self.cached = None
+        # True pentru folderele care trebuie re-agregate (schimbate ele sau ceva din subarbore)
+        self.dirty = False
+
+    def mark_dirty(self):
+        """Marchează folderul și strămoșii lui (până la primul deja marcat) pentru re-agregare."""
+        info = self
+        while info is not None and not info.dirty:
+            info.dirty = True
+            info = info.parent
+
+    def merge(self, oldest_time, oldest_file, newest_time, newest_file):
+        """Combină o pereche (cel mai vechi, cel mai nou) în extremele folderului."""
+        if oldest_time is not None and (self.oldest_time is None or oldest_time < self.oldest_time):
+            self.oldest_time = oldest_time
+            self.oldest_file = oldest_file
+        if newest_time is not None and (self.newest_time is None or newest_time > self.newest_time):
+            self.newest_time = newest_time
+            self.newest_file = newest_file
+
+    def extreme(self, use_oldest):
+        """Returnează (timestamp, calea_fișierului) pentru modul ales."""
+        if use_oldest:
+            return self.oldest_time, self.oldest_file
+        return self.newest_time, self.newest_file
+
+    def to_snapshot(self):
+        """Intrarea din snapshot pentru acest folder (fișierele extreme sunt relative la folder)."""
+        return {
+            'mtime': self.mtime,
+            'files': self.file_count,
+            'own': list(self.own),
+            'oldest': self.oldest_time,
+            'oldest_file': self.oldest_file and os.path.relpath(self.oldest_file, self.path),
+            'newest': self.newest_time,
+            'newest_file': self.newest_file and os.path.relpath(self.newest_file, self.path),
+            'subdirs': self.subdirs,
+        }
 
 class WorkerThread(QThread):
     progress = pyqtSignal(str)
     progress_value = pyqtSignal(int)
     finished = pyqtSignal()
-    log_message = pyqtSignal(str)
+    log_batch = pyqtSignal(list)
 
-    def __init__(self, start_path, use_oldest=True):
+    def __init__(self, start_path, use_oldest=True, apply_workers=DEFAULT_APPLY_WORKERS,
+                 incremental=False, snapshot_file=SNAPSHOT_FILE, log_level=logging.INFO,
+                 scan_workers=DEFAULT_SCAN_WORKERS, dry_run=False):
         super().__init__()
         self.start_path = start_path
         self.is_running = True
         self.use_oldest = use_oldest  # True pentru cea mai veche dată, False pentru cea mai nouă
+        self.apply_workers = max(1, apply_workers)
+        self.scan_workers = max(1, scan_workers)
+        self.incremental = incremental
+        self.dry_run = dry_run  # True: doar planificare, fără os.utime și fără salvarea snapshot-ului
+        self.snapshot_file = snapshot_file
+        self.stats = {'folders': 0, 'listed': 0, 'reused': 0, 'planned': 0,
+                      'updated': 0, 'skipped': 0, 'empty': 0, 'errors': 0}
+        self.stats_lock = threading.Lock()
+        self.log_buffer = LogBuffer(self.log_batch.emit, level=log_level)
+        self.last_percent = -1
+
+    def summary(self):
+        """Rezumatul rulării (folosit de modul fără interfață pentru ieșirea JSON)."""
+        return {
+            'path': os.path.abspath(self.start_path),
+            'mode': 'oldest' if self.use_oldest else 'newest',
+            'dry_run': self.dry_run,
+            'incremental': self.incremental,
+            'cancelled': not self.is_running,
+            **self.stats,
+        }
+
+    def log(self, level, message):
+        """Trimite un mesaj către bufferul de log (sigur și din firele pool-ului)."""
+        self.log_buffer.add(level, message)
+
+    def report_progress(self, done, total):
+        """Emite progresul doar când procentul se schimbă, nu pentru fiecare folder."""
+        percent = int(done / total * 100)
+        if percent != self.last_percent or done == total:
+            self.last_percent = percent
+            self.progress_value.emit(percent)
+            self.progress.emit(f"Procesat folder {done} din {total}")
+            self.log_buffer.flush_if_due()
+
+    def relative_key(self, path):
+        """Cheia unui folder în snapshot: calea relativă la rădăcină."""
+        return os.path.relpath(path, self.start_path)
 
-    def get_extreme_file_date_in_tree(self, folder_path):
+    def load_snapshot(self):
+        """Încarcă snapshot-ul salvat pentru rădăcina curentă (dicționar gol dacă nu există)."""
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get(os.path.abspath(self.start_path), {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.log(logging.ERROR, f"Eroare la citirea snapshot-ului: {str(e)}. Se face scanare completă.")
+            return {}
+
+    def save_snapshot(self, folders):
+        """Salvează snapshot-ul rădăcinii curente, păstrând celelalte rădăcini din fișier."""
+        try:
+            try:
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            data[os.path.abspath(self.start_path)] = {
+                self.relative_key(info.path): info.to_snapshot() for info in folders}
+            temp_file = self.snapshot_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_file, self.snapshot_file)
+        except Exception as e:
+            self.log(logging.ERROR, f"Eroare la salvarea snapshot-ului: {str(e)}")
+
+    def scan_folder(self, info):
         """
-        Caută cea mai veche sau cea mai nouă dată a fișierelor în folderul curent ȘI în toate subfolderele sale.
-        Returnează (timestamp, calea_fișierului) pentru fișierul găsit.
+        Listează un singur folder cu os.scandir: fiecare fișier este citit (stat) o singură dată,
+        iar subfolderele sunt returnate ca (cale, mtime) pentru a fi parcurse mai departe.
         """
-        extreme_time = None
-        extreme_file_path = None
-
-        # Parcurgem toate fișierele din folder și subfoldere
+        subfolders = []
+        log_files = self.log_buffer.enabled(logging.DEBUG)
         try:
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
+            with os.scandir(info.path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subfolders.append((entry.path, entry.stat(follow_symlinks=False).st_mtime))
+                            info.subdirs.append(entry.name)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError as e:
+                        self.log(logging.ERROR, f"Eroare la citirea folderului {entry.path}: {str(e)}")
+                        continue
                     try:
-                        file_time = os.path.getmtime(file_path)
-                        if extreme_time is None or \
-                           (self.use_oldest and file_time < extreme_time) or \
-                           (not self.use_oldest and file_time > extreme_time):
-                            extreme_time = file_time
-                            extreme_file_path = file_path
-                            self.log_message.emit(
-                                f"Găsit fișier {'mai vechi' if self.use_oldest else 'mai nou'}: "
-                                f"{file_path} cu data {datetime.fromtimestamp(file_time)}")
+                        file_time = entry.stat().st_mtime
                     except Exception as e:
-                        self.log_message.emit(f"Eroare la citirea datei fișierului {file_path}: {str(e)}")
-        
+                        self.log(logging.ERROR, f"Eroare la citirea datei fișierului {entry.path}: {str(e)}")
+                        continue
+                    info.file_count += 1
+                    previous_time, _ = info.extreme(self.use_oldest)
+                    info.merge(file_time, entry.path, file_time, entry.path)
+                    if log_files and info.extreme(self.use_oldest)[0] != previous_time:
+                        self.log(logging.DEBUG,
+                            f"Găsit fișier {'mai vechi' if self.use_oldest else 'mai nou'}: "
+                            f"{entry.path} cu data {datetime.fromtimestamp(file_time)}")
         except Exception as e:
-            self.log_message.emit(f"Eroare la parcurgerea folderului {folder_path}: {str(e)}")
+            self.log(logging.ERROR, f"Eroare la parcurgerea folderului {info.path}: {str(e)}")
+        info.own = (info.oldest_time, info.oldest_file and os.path.basename(info.oldest_file),
+                    info.newest_time, info.newest_file and os.path.basename(info.newest_file))
+        return subfolders
+
+    def reuse_folder(self, info, cached):
+        """
+        Refolosește datele din snapshot pentru un folder al cărui mtime nu s-a schimbat:
+        fișierele nu mai sunt listate, se citește doar mtime-ul subfolderelor cunoscute
+        (o schimbare în adâncime modifică doar mtime-ul folderului în care a avut loc).
+        Extremele subarborelui din snapshot sunt păstrate pentru a evita re-agregarea.
+        """
+        info.file_count = cached['files']
+        info.own = tuple(cached['own'])
+        oldest_time, oldest_name, newest_time, newest_name = info.own
+        info.merge(oldest_time, oldest_name and os.path.join(info.path, oldest_name),
+                   newest_time, newest_name and os.path.join(info.path, newest_name))
+        subfolders = []
+        for name in cached['subdirs']:
+            path = os.path.join(info.path, name)
+            try:
+                subfolders.append((path, os.stat(path, follow_symlinks=False).st_mtime))
+                info.subdirs.append(name)
+            except OSError as e:
+                self.log(logging.ERROR, f"Eroare la citirea folderului {path}: {str(e)}")
+        # Snapshot-urile mai vechi nu au fișierele extreme; un subfolder dispărut schimbă agregatul
+        if 'oldest_file' in cached and len(info.subdirs) == len(cached['subdirs']):
+            oldest_file, newest_file = cached['oldest_file'], cached['newest_file']
+            info.cached = (cached['oldest'], oldest_file and os.path.join(info.path, oldest_file),
+                           cached['newest'], newest_file and os.path.join(info.path, newest_file))
+        return subfolders
+
+    def list_folder(self, info, snapshot):
+        """
+        Listează un folder sau, dacă mtime-ul lui coincide cu snapshot-ul, îi refolosește datele.
+        Poate fi apelată simultan din mai multe fire de scanare.
+        """
+        cached = snapshot.get(self.relative_key(info.path)) if snapshot else None
+        if cached is not None and cached['mtime'] == info.mtime:
+            subfolders = self.reuse_folder(info, cached)
+            key = 'reused'
+        else:
+            subfolders = self.scan_folder(info)
+            key = 'listed'
+        with self.stats_lock:
+            self.stats[key] += 1
+            scanned = self.stats['listed'] + self.stats['reused']
+        if scanned % 100 == 0:
+            self.progress.emit(f"Scanat {scanned} foldere...")
+            self.log_buffer.flush_if_due()
+        return subfolders
 
-        return extreme_time, extreme_file_path
+    def scan_subtree(self, top, snapshot):
+        """
+        Parcurge în lățime subarborele cu rădăcina top, listând fiecare folder cel mult o dată.
+        Returnează lista FolderInfo (părinții înaintea copiilor) sau None la anulare.
+        """
+        folders = [top]
+        index = 0
+        while index < len(folders):
+            if not self.is_running:
+                return None
+            info = folders[index]
+            index += 1
+            for path, mtime in self.list_folder(info, snapshot):
+                child = FolderInfo(path, info.depth + 1, mtime, info)
+                info.children.append(child)
+                folders.append(child)
+        return folders
 
-    def process_folder(self, folder_path):
-        """Procesează un singur folder."""
+    def scan_tree(self, start_path, snapshot=None):
+        """
+        Parcurge arborele o singură dată și agregă datele de jos în sus.
+        Folderele din snapshot al căror mtime nu s-a schimbat nu mai sunt listate.
+        Cu mai multe fire de scanare, subarborii de pe primul nivel sunt parcurși în paralel,
+        iar rezultatele sunt reunite în ordinea listării rădăcinii.
+        Returnează lista FolderInfo (părinții înaintea copiilor) sau None dacă procesarea
+        a fost anulată.
+        """
         try:
-            extreme_time, extreme_file = self.get_extreme_file_date_in_tree(folder_path)
-            
-            if extreme_time is not None:
-                try:
-                    os.utime(folder_path, (extreme_time, extreme_time))
-                    self.log_message.emit(
-                        f"Setat data folderului {folder_path} la {datetime.fromtimestamp(extreme_time)}")
-                    self.log_message.emit(
-                        f"Data luată de la fișierul: {extreme_file}")
-                except PermissionError:
-                    self.log_message.emit(
-                        f"WARNING: Nu s-a putut modifica data folderului {folder_path} - acces interzis sau folder în lucru. Continuăm cu următorul...")
-                except OSError as e:
-                    self.log_message.emit(
-                        f"WARNING: Nu s-a putut modifica data folderului {folder_path} - {str(e)}. Continuăm cu următorul...")
+            root_mtime = os.stat(start_path).st_mtime
+        except OSError as e:
+            self.log(logging.ERROR, f"Eroare la colectarea folderelor: {str(e)}")
+            return None
+
+        snapshot = snapshot or {}
+        root = FolderInfo(start_path, 0, root_mtime)
+        if self.scan_workers <= 1:
+            folders = self.scan_subtree(root, snapshot)
+        else:
+            for path, mtime in self.list_folder(root, snapshot):
+                root.children.append(FolderInfo(path, 1, mtime, root))
+            with ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+                # map păstrează ordinea subarborilor, indiferent de ordinea terminării
+                subtrees = list(executor.map(
+                    lambda top: self.scan_subtree(top, snapshot), root.children))
+            folders = [root]
+            for subtree in subtrees:
+                if subtree is None:
+                    folders = None
+                    break
+                folders.extend(subtree)
+        if folders is None or not self.is_running:
+            return None
+
+        # Doar folderele listate din nou (sau fără agregat în snapshot) și strămoșii lor
+        # sunt re-agregați; subarborii neschimbați își păstrează extremele din snapshot
+        for info in folders:
+            if info.cached is None:
+                info.mark_dirty()
+
+        # Agregare de jos în sus: copiii sunt mereu după părinți în listă
+        for info in reversed(folders):
+            if not info.dirty:
+                info.oldest_time, info.oldest_file, info.newest_time, info.newest_file = info.cached
+                continue
+            for child in info.children:
+                info.merge(child.oldest_time, child.oldest_file,
+                           child.newest_time, child.newest_file)
+        return folders
+
+    def plan_updates(self, folders):
+        """
+        Faza de planificare: calculează data țintă pentru fiecare folder și o compară cu
+        st_mtime citit deja la scanare. Returnează lista (folder, timestamp, fișier sursă)
+        doar pentru folderele care trebuie modificate, de la cele mai adânci spre rădăcină.
+        """
+        plan = []
+        for info in folders:
+            extreme_time, extreme_file = info.extreme(self.use_oldest)
+            if extreme_time is None:
+                self.stats['empty'] += 1
+                self.log(logging.INFO,
+                    f"Nu s-au găsit fișiere în {info.path} sau în substructura sa")
+            elif abs(info.mtime - extreme_time) <= MTIME_TOLERANCE:
+                self.stats['skipped'] += 1
             else:
-                self.log_message.emit(
-                    f"Nu s-au găsit fișiere în {folder_path} sau în substructura sa")
-        
+                plan.append((info, extreme_time, extreme_file))
+        plan.sort(key=lambda item: item[0].depth, reverse=True)
+        return plan
+
+    def process_folder(self, info, extreme_time, extreme_file):
+        """Aplică data calculată pe un singur folder. Returnează True dacă s-a reușit."""
+        try:
+            os.utime(info.path, (extreme_time, extreme_time))
+            info.mtime = extreme_time
+            self.log(logging.INFO,
+                f"Setat data folderului {info.path} la {datetime.fromtimestamp(extreme_time)}")
+            self.log(logging.INFO,
+                f"Data luată de la fișierul: {extreme_file}")
+            return True
+        except PermissionError:
+            self.log(logging.WARNING,
+                f"WARNING: Nu s-a putut modifica data folderului {info.path} - acces interzis sau folder în lucru. Continuăm cu următorul...")
+        except OSError as e:
+            self.log(logging.WARNING,
+                f"WARNING: Nu s-a putut modifica data folderului {info.path} - {str(e)}. Continuăm cu următorul...")
         except Exception as e:
-            self.log_message.emit(f"Eroare la procesarea folderului {folder_path}: {str(e)}")
+            self.log(logging.ERROR, f"Eroare la procesarea folderului {info.path}: {str(e)}")
+        return False
+
+    def apply_updates(self, plan):
+        """
+        Faza de aplicare: trimite apelurile os.utime către un pool limitat de fire,
+        nivel cu nivel, de la cele mai adânci foldere spre rădăcină.
+        """
+        total = len(plan)
+        if total == 0:
+            self.progress_value.emit(100)
+            return
+
+        levels = []
+        for item in plan:
+            if not levels or levels[-1][0][0].depth != item[0].depth:
+                levels.append([])
+            levels[-1].append(item)
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.apply_workers) as executor:
+            for level in levels:
+                if not self.is_running:
+                    return
+                # Un nivel se termină complet înainte de a trece la părinți
+                futures = [executor.submit(self.process_folder, *item) for item in level]
+                for future in as_completed(futures):
+                    if future.result():
+                        self.stats['updated'] += 1
+                    else:
+                        self.stats['errors'] += 1
+                    done += 1
+                    self.report_progress(done, total)
 
     def run(self):
-        self.log_message.emit(
+        self.log(logging.INFO,
             f"Începere procesare pentru path: {self.start_path} "
             f"(folosind {'cea mai veche' if self.use_oldest else 'cea mai nouă'} dată)")
         
-        # Colectăm toate folderele
-        all_folders = []
-        try:
-            for root, dirs, _ in os.walk(self.start_path):
-                for dir_name in dirs:
-                    all_folders.append(os.path.join(root, dir_name))
-        except Exception as e:
-            self.log_message.emit(f"Eroare la colectarea folderelor: {str(e)}")
+        # O singură parcurgere a arborelui, cu agregare de jos în sus
+        snapshot = self.load_snapshot() if self.incremental else None
+        folders = self.scan_tree(self.start_path, snapshot)
+        if folders is None:
+            if not self.is_running:
+                self.log(logging.INFO, "Procesare anulată!")
+            self.log_buffer.flush()
+            self.finished.emit()
             return
+        self.stats['folders'] = len(folders)
+        if self.incremental:
+            self.log(logging.INFO,
+                f"Snapshot: {self.stats['reused']} foldere refolosite, "
+                f"{self.stats['listed']} foldere re-listate")
         
-        # Procesăm de la cele mai adânci spre rădăcină
-        all_folders.sort(key=lambda x: x.count(os.sep), reverse=True)
-        total_folders = len(all_folders)
+        plan = self.plan_updates(folders)
+        self.stats['planned'] = len(plan)
+        self.log(logging.INFO,
+            f"Plan: {len(plan)} foldere de modificat, "
+            f"{self.stats['skipped']} au deja data corectă")
         
-        for index, folder_path in enumerate(all_folders):
-            if not self.is_running:
-                self.log_message.emit("Procesare anulată!")
-                break
-                
-            self.process_folder(folder_path)
-            progress = int((index + 1) / total_folders * 100)
-            self.progress_value.emit(progress)
-            self.progress.emit(f"Procesat folder {index + 1} din {total_folders}")
+        if self.dry_run:
+            self.log(logging.INFO, "Simulare: nu s-a modificat nicio dată.")
+            for info, extreme_time, extreme_file in plan:
+                self.log(logging.DEBUG,
+                    f"Ar fi setat data folderului {info.path} la {datetime.fromtimestamp(extreme_time)}")
+        else:
+            self.apply_updates(plan)
+            if self.incremental:
+                # mtime-urile din snapshot reflectă datele tocmai aplicate
+                self.save_snapshot(folders)
         
         if self.is_running:
-            # Procesăm și folderul rădăcină la final
-            self.process_folder(self.start_path)
+            self.log(logging.INFO,
+                f"Foldere modificate: {self.stats['updated']}, "
+                f"scrieri evitate: {self.stats['skipped']}, "
+                f"erori: {self.stats['errors']}")
             self.progress.emit("Procesare completă!")
+        else:
+            self.log(logging.INFO, "Procesare anulată!")
         
+        self.log_buffer.flush()
         self.finished.emit()
 
     def stop(self):
@@ -148,16 +588,45 @@ class MainWindow(QMainWindow):
         self.date_combo.addItem("Cea mai nouă dată")
         top_layout.addWidget(self.date_combo)
         
+        # Numărul de fire pentru scanarea subarborilor
+        top_layout.addWidget(QLabel("Fire scanare:"))
+        self.scan_workers_spin = QSpinBox()
+        self.scan_workers_spin.setRange(1, 64)
+        self.scan_workers_spin.setValue(DEFAULT_SCAN_WORKERS)
+        top_layout.addWidget(self.scan_workers_spin)
+        
+        # Numărul de fire pentru aplicarea datelor
+        top_layout.addWidget(QLabel("Fire aplicare:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 64)
+        self.workers_spin.setValue(DEFAULT_APPLY_WORKERS)
+        top_layout.addWidget(self.workers_spin)
+        
+        # Rulare incrementală pe baza snapshot-ului salvat
+        self.incremental_check = QCheckBox("Incremental (snapshot)")
+        self.incremental_check.setToolTip(
+            "Re-listează doar folderele a căror dată s-a schimbat de la rularea anterioară. "
+            "Fișierele modificate pe loc (fără redenumire/adăugare) nu sunt detectate.")
+        top_layout.addWidget(self.incremental_check)
+        
+        # Nivelul de detaliu al logului
+        self.log_level_combo = QComboBox()
+        for label, level in LOG_LEVELS:
+            self.log_level_combo.addItem(label, level)
+        top_layout.addWidget(self.log_level_combo)
+        
         layout.addLayout(top_layout)
 
         # Bară de progres
         self.progress_bar = QProgressBar()
         layout.addWidget(self.progress_bar)
 
-        # Text edit pentru loguri
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        layout.addWidget(self.log_text)
+        # Fereastra de log: randează doar liniile vizibile din ultimele LOG_VIEW_LINES
+        self.log_model = LogModel()
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        layout.addWidget(self.log_view)
 
         # Butoane
         self.start_btn = QPushButton("Start")
@@ -176,6 +645,7 @@ class MainWindow(QMainWindow):
 
         self.selected_path = None
         self.worker = None
+        self.file_log = None
 
     def browse_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Selectează folder")
@@ -185,7 +655,7 @@ class MainWindow(QMainWindow):
             self.start_btn.setEnabled(True)
             self.progress_bar.setValue(0)
             self.status_label.setText("")
-            self.log_text.clear()
+            self.log_model.clear()
 
     def start_processing(self):
         if not self.selected_path:
@@ -197,13 +667,17 @@ class MainWindow(QMainWindow):
         self.cancel_btn.setEnabled(True)
         self.status_label.setText("Procesare în curs...")
         self.progress_bar.setValue(0)
-        self.log_text.clear()
+        self.log_model.clear()
         
-        self.worker = WorkerThread(self.selected_path, use_oldest)
+        self.file_log = start_file_log()
+        self.worker = WorkerThread(self.selected_path, use_oldest, self.workers_spin.value(),
+                                   self.incremental_check.isChecked(),
+                                   log_level=self.log_level_combo.currentData(),
+                                   scan_workers=self.scan_workers_spin.value())
         self.worker.progress.connect(self.update_status)
         self.worker.progress_value.connect(self.update_progress)
         self.worker.finished.connect(self.processing_finished)
-        self.worker.log_message.connect(self.add_log)
+        self.worker.log_batch.connect(self.add_log)
         self.worker.start()
 
     def cancel_processing(self):
@@ -217,18 +691,79 @@ class MainWindow(QMainWindow):
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
-    def add_log(self, message):
-        self.log_text.append(message)
-        # Auto-scroll la ultimul mesaj
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+    def add_log(self, lines):
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_lines(lines)
+        # Auto-scroll la ultimul mesaj, doar dacă utilizatorul nu a derulat în sus
+        if at_bottom:
+            self.log_view.scrollToBottom()
 
     def processing_finished(self):
         self.start_btn.setEnabled(True)
         self.cancel_btn.setEnabled(False)
+        if self.file_log:
+            stop_file_log(self.file_log)
+            self.file_log = None
+        self.status_label.setText(f"{self.status_label.text()} Log complet: {os.path.abspath(LOG_FILE)}")
+
+def print_log_batch(lines):
+    sys.stderr.write('\n'.join(lines) + '\n')
+
+def run_headless(argv):
+    """Rulează aceeași logică WorkerThread fără interfață grafică și scrie un rezumat JSON."""
+    parser = argparse.ArgumentParser(
+        description="Fixează data folderelor după cel mai vechi sau cel mai nou fișier din substructură.")
+    parser.add_argument('path', help="folderul rădăcină")
+    parser.add_argument('--newest', action='store_true',
+                        help="folosește cea mai nouă dată (implicit: cea mai veche)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="doar calculează planul, fără a modifica date")
+    parser.add_argument('--incremental', action='store_true',
+                        help="refolosește snapshot-ul pentru folderele nemodificate")
+    parser.add_argument('--snapshot-file', default=SNAPSHOT_FILE)
+    parser.add_argument('--scan-workers', type=int, default=DEFAULT_SCAN_WORKERS)
+    parser.add_argument('--apply-workers', type=int, default=DEFAULT_APPLY_WORKERS)
+    parser.add_argument('--verbose', action='store_true',
+                        help="include în log fiecare fișier găsit")
+    parser.add_argument('--quiet', action='store_true', help="nu afișa logul pe stderr")
+    parser.add_argument('--log-file', help="scrie logul complet și în acest fișier")
+    parser.add_argument('--json', dest='json_output', default='-',
+                        help="fișierul pentru rezumatul JSON ('-' = stdout)")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.path):
+        parser.error(f"Folderul nu există: {args.path}")
+
+    worker = WorkerThread(args.path, not args.newest, args.apply_workers, args.incremental,
+                          args.snapshot_file, logging.DEBUG if args.verbose else logging.INFO,
+                          args.scan_workers, args.dry_run)
+    if not args.quiet:
+        # Fără buclă de evenimente Qt, mesajele trebuie livrate direct din firul care le emite
+        worker.log_batch.connect(print_log_batch, Qt.DirectConnection)
+    file_log = start_file_log(args.log_file) if args.log_file else None
+    start_time = time.perf_counter()
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+    finally:
+        if file_log:
+            stop_file_log(file_log)
+
+    summary = worker.summary()
+    summary['elapsed_seconds'] = round(time.perf_counter() - start_time, 3)
+    if args.json_output == '-':
+        json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write('\n')
+    else:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 1 if summary['errors'] or summary['cancelled'] else 0
 
 if __name__ == '__main__':
+    # Cu argumente în linia de comandă rulează fără interfață grafică
+    if len(sys.argv) > 1:
+        sys.exit(run_headless(sys.argv[1:]))
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
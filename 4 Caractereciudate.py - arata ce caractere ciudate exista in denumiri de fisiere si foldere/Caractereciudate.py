@@ -1,13 +1,656 @@
 import sys
 import os
 import json
+import re
+import csv
+import time
+import unicodedata
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QFileDialog, 
                            QVBoxLayout, QWidget, QTextEdit, QLabel, QLineEdit,
                            QHBoxLayout, QMessageBox, QListWidget, QDialog, 
-                           QDialogButtonBox, QFrame)
-from PyQt5.QtCore import Qt
+                           QDialogButtonBox, QFrame, QProgressBar, QTableView,
+                           QComboBox, QHeaderView, QAbstractItemView, QCheckBox,
+                           QTabWidget, QSpinBox)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex,
+                          QSortFilterProxyModel)
 from PyQt5.QtGui import QFont
 
+class CharMatcher:
+    """
+    Verificator de nume compilat o singură dată din setul de caractere permise.
+    Numele formate doar din caractere permise sunt respinse printr-o singură căutare regex;
+    setul de caractere neobișnuite se construiește doar pentru numele care conțin ceva.
+    """
+    def __init__(self, allowed_chars):
+        self.allowed_chars = frozenset(allowed_chars)
+        escaped = ''.join(re.escape(char) for char in sorted(self.allowed_chars))
+        self.unusual_pattern = re.compile(f'[^{escaped}]') if escaped else re.compile('.', re.DOTALL)
+
+    def find_unusual(self, name):
+        """Returnează setul caracterelor nepermise din nume sau None dacă numele e curat."""
+        if self.unusual_pattern.search(name) is None:
+            return None
+        return set(name) - self.allowed_chars
+
+# Intervalul (secunde) la care scanarea trimite rezultatele noi către interfață
+BATCH_INTERVAL = 0.2
+# Fișierul cu indexul listărilor de foldere, refolosit între scanări
+INDEX_FILE = "scanner_index.json"
+# Numărul maxim de căi exemplu păstrate pentru fiecare caracter în raport
+SAMPLE_SIZE = 5
+# Numărul maxim de rezultate trimise de un proces de scanare într-un lot
+SHARD_EMIT_SIZE = 5000
+
+class CharHistogram:
+    """
+    Agregate per caracter neobișnuit, calculate în aceeași trecere cu scanarea: apariții,
+    împărțirea fișiere/foldere și câteva căi exemplu. Memoria depinde doar de numărul
+    de caractere distincte, nu de numărul de rezultate.
+    """
+    FIELDS = ["caracter", "cod", "nume_unicode", "categorie", "aparitii", "fisiere", "foldere", "exemple"]
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.stats = {}  # caracter -> [apariții, fișiere, foldere, exemple]
+
+    def add(self, name, path, unusual, is_dir):
+        for char in unusual:
+            item = self.stats.get(char)
+            if item is None:
+                item = self.stats[char] = [0, 0, 0, []]
+            item[0] += name.count(char)
+            item[2 if is_dir else 1] += 1
+            if len(item[3]) < self.sample_size:
+                item[3].append(path)
+
+    def merge(self, stats):
+        """Adaugă agregatele altei histograme (de la un proces de scanare)."""
+        for char, (occurrences, files, folders, samples) in stats.items():
+            item = self.stats.get(char)
+            if item is None:
+                item = self.stats[char] = [0, 0, 0, []]
+            item[0] += occurrences
+            item[1] += files
+            item[2] += folders
+            item[3].extend(samples[:self.sample_size - len(item[3])])
+
+    def rows(self, hidden_chars=frozenset()):
+        """Rândurile raportului, de la cel mai frecvent caracter, fără caracterele ascunse."""
+        chars = sorted((char for char in self.stats if char not in hidden_chars),
+                       key=lambda char: (-self.stats[char][0], char))
+        for char in chars:
+            occurrences, files, folders, samples = self.stats[char]
+            yield {
+                "caracter": char,
+                "cod": f"U+{ord(char):04X}",
+                "nume_unicode": unicodedata.name(char, ""),
+                "categorie": unicodedata.category(char),
+                "aparitii": occurrences,
+                "fisiere": files,
+                "foldere": folders,
+                "exemple": samples,
+            }
+
+    def export_csv(self, path, hidden_chars=frozenset()):
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            for row in self.rows(hidden_chars):
+                writer.writerow([row[field] if field != "exemple" else ' | '.join(row[field])
+                                 for field in self.FIELDS])
+
+    def export_json(self, path, hidden_chars=frozenset()):
+        # Scris rând cu rând, fără a construi întregul document în memorie
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('[\n')
+            for index, row in enumerate(self.rows(hidden_chars)):
+                if index:
+                    f.write(',\n')
+                f.write(json.dumps(row, ensure_ascii=False))
+            f.write('\n]\n')
+
+def folder_stamp(path):
+    """
+    Amprenta unui folder pentru index: mtime-ul în nanosecunde și, pe POSIX, ctime-ul.
+    mtime-ul singur nu ajunge, fiindcă poate fi rescris cu os.utime (folderdate.py face asta
+    pentru fiecare folder); ctime-ul se schimbă la orice modificare și nu poate fi readus înapoi.
+    Pe Windows st_ctime este data creării, deci acolo rămâne doar mtime-ul.
+    """
+    stat = os.stat(path)
+    if os.name == 'nt':
+        return [stat.st_mtime_ns]
+    return [stat.st_mtime_ns, stat.st_ctime_ns]
+
+class ListingIndex:
+    """
+    Index pe disc al listărilor de foldere, cheiat după cale și invalidat după amprenta
+    folderului (folder_stamp). Adăugarea, ștergerea sau redenumirea unei intrări schimbă
+    amprenta folderului părinte, deci doar folderele modificate sunt re-listate la o nouă scanare.
+    Fiecare intrare este [amprentă, nume, tipuri], unde tipuri are câte o literă per nume:
+    'd' folder, 'l' folder legătură (nu se parcurge), 'f' fișier.
+    Dezactivat (enabled=False), doar listează, fără să păstreze nimic.
+    """
+    def __init__(self, index_file=INDEX_FILE, enabled=True):
+        self.index_file = index_file
+        self.enabled = enabled
+        self.cached = {}
+        self.fresh = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.cached = json.load(f)
+        except (OSError, ValueError):
+            self.cached = {}
+
+    def save(self, root, complete):
+        """
+        Salvează indexul. După o scanare completă, folderele din root care nu mai au fost
+        văzute (șterse) sunt eliminate; după o anulare se păstrează intrările vechi.
+        """
+        if complete:
+            prefix = os.path.join(root, '')
+            listings = {path: listing for path, listing in self.cached.items()
+                        if path != root and not path.startswith(prefix)}
+        else:
+            listings = dict(self.cached)
+        listings.update(self.fresh)
+        temp_file = self.index_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(listings, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, self.index_file)
+        return len(listings)
+
+    def list_dir(self, path):
+        """Returnează (nume, tipuri) pentru folder, din index dacă amprenta nu s-a schimbat."""
+        if self.enabled:
+            stamp = folder_stamp(path)
+            cached = self.cached.get(path)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+                self.fresh[path] = cached
+                return cached[1], cached[2]
+        
+        self.misses += 1
+        names = []
+        kinds = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                names.append(entry.name)
+                if is_dir:
+                    kinds.append('l' if entry.is_symlink() else 'd')
+                else:
+                    kinds.append('f')
+        kinds = ''.join(kinds)
+        if self.enabled:
+            self.fresh[path] = [stamp, names, kinds]
+        return names, kinds
+
+    def summary(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0
+        try:
+            size_mb = os.path.getsize(self.index_file) / (1024 * 1024)
+        except OSError:
+            size_mb = 0
+        return (f"Index: {len(self.fresh)} foldere ({size_mb:.1f} MB), "
+                f"refolosite {self.hits} din {total} ({hit_rate:.0f}%)")
+
+class TreeScanner:
+    """
+    Logica de scanare fără Qt: verifică numele dintr-un folder, actualizează histograma și
+    numărătorile modului raport. Folosită atât de ScanWorker, cât și de procesele de scanare paralelă.
+    """
+    def __init__(self, allowed_chars, index, report_only=False, ignored_chars=frozenset()):
+        self.find_unusual = CharMatcher(allowed_chars).find_unusual
+        self.index = index
+        self.histogram = CharHistogram()
+        # În modul raport rezultatele individuale nu sunt păstrate, doar histograma
+        self.report_only = report_only
+        self.ignored_chars = frozenset(ignored_chars)
+        self.report_files = 0
+        self.report_folders = 0
+
+    def scan_dir(self, root):
+        """
+        Verifică numele intrărilor din root. Returnează (rezultate, subfoldere), rezultatele
+        fiind în ordinea os.walk: întâi directoarele, apoi fișierele.
+        """
+        names, kinds = self.index.list_dir(root)
+        dir_hits = []
+        file_hits = []
+        subdirs = []
+        for name, kind in zip(names, kinds):
+            is_dir = kind != 'f'
+            if kind == 'd':
+                subdirs.append(os.path.join(root, name))
+            unusual = self.find_unusual(name)
+            if unusual:
+                path = os.path.join(root, name)
+                self.histogram.add(name, path, unusual, is_dir)
+                if self.report_only:
+                    if not unusual <= self.ignored_chars:
+                        if is_dir:
+                            self.report_folders += 1
+                        else:
+                            self.report_files += 1
+                    continue
+                hit = (path, ''.join(sorted(unusual)), is_dir)
+                (dir_hits if is_dir else file_hits).append(hit)
+        dir_hits.extend(file_hits)
+        return dir_hits, subdirs
+
+    def merge_shard(self, result):
+        """Adaugă rezultatele agregate ale unui proces de scanare."""
+        self.histogram.merge(result['histogram'])
+        self.index.fresh.update(result['listings'])
+        self.index.hits += result['index_hits']
+        self.index.misses += result['index_misses']
+        self.report_files += result['report_files']
+        self.report_folders += result['report_folders']
+
+# Starea partajată a proceselor de scanare paralelă (setată de init_shard_worker)
+_shard_stop = None
+_shard_visited = None
+_shard_discovered = None
+_shard_results = None
+
+def init_shard_worker(stop_event, visited, discovered, results):
+    global _shard_stop, _shard_visited, _shard_discovered, _shard_results
+    _shard_stop = stop_event
+    _shard_visited = visited
+    _shard_discovered = discovered
+    _shard_results = results
+    # La anulare loturile necitite pot fi abandonate, ca procesul să se poată închide
+    results.cancel_join_thread()
+
+def scan_shard(top, allowed_chars, listings, report_only, ignored_chars, use_index):
+    """
+    Rulează într-un proces separat: scanează subarborele top (în aceeași ordine ca scanarea
+    pe un fir). Rezultatele sunt trimise pe parcurs, în loturi, prin coada _shard_results
+    ca ('hits', lot), urmate la final de ('done', top); returnează agregatele pentru
+    histogramă și index.
+    """
+    try:
+        index = ListingIndex(enabled=use_index)
+        index.cached = listings
+        scanner = TreeScanner(allowed_chars, index, report_only, ignored_chars)
+        hits = []
+        last_send = time.monotonic()
+        pending = [top]
+        while pending and not _shard_stop.is_set():
+            root = pending.pop()
+            try:
+                dir_hits, subdirs = scanner.scan_dir(root)
+            except OSError:
+                dir_hits, subdirs = [], []
+            hits.extend(dir_hits)
+            pending.extend(reversed(subdirs))
+            with _shard_visited.get_lock():
+                _shard_visited.value += 1
+            with _shard_discovered.get_lock():
+                _shard_discovered.value += len(subdirs)
+            if hits and (len(hits) >= SHARD_EMIT_SIZE or time.monotonic() - last_send >= BATCH_INTERVAL):
+                _shard_results.put(('hits', hits))
+                hits = []
+                last_send = time.monotonic()
+        if hits:
+            _shard_results.put(('hits', hits))
+    finally:
+        _shard_results.put(('done', top))
+    return {
+        'histogram': scanner.histogram.stats,
+        'listings': index.fresh,
+        'index_hits': index.hits,
+        'index_misses': index.misses,
+        'report_files': scanner.report_files,
+        'report_folders': scanner.report_folders,
+    }
+
+class ScanWorker(QThread):
+    """Scanează arborele pe un fir separat și trimite rezultatele în loturi, pe măsură ce apar."""
+    hits_found = pyqtSignal(list)    # loturi de (cale, caractere neobișnuite, este_folder)
+    progress = pyqtSignal(int, int)  # foldere vizitate, foldere descoperite
+    finished = pyqtSignal(bool)      # True dacă scanarea a fost anulată
+    report_counts = pyqtSignal(int, int)  # în modul raport: fișiere, foldere cu caractere nepermise
+
+    def __init__(self, folder, allowed_chars, use_index=True, report_only=False,
+                 ignored_chars=frozenset(), processes=1):
+        super().__init__()
+        self.folder = folder
+        self.allowed_chars = frozenset(allowed_chars)
+        self.index = ListingIndex(enabled=use_index)
+        self.use_index = use_index
+        self.index_summary = ""
+        self.scanner = TreeScanner(self.allowed_chars, self.index, report_only, ignored_chars)
+        self.histogram = self.scanner.histogram
+        self.report_only = report_only
+        self.processes = processes
+        self.is_running = True
+        # Subarborii care nu au putut fi scanați (erori ale proceselor de scanare)
+        self.scan_errors = []
+
+    def stop(self):
+        self.is_running = False
+
+    def emit_progress(self, visited, discovered):
+        self.progress.emit(visited, discovered)
+        if self.report_only:
+            self.report_counts.emit(self.scanner.report_files, self.scanner.report_folders)
+
+    def scan_serial(self):
+        batch = []
+        visited = 0
+        discovered = 1
+        last_emit = time.monotonic()
+        
+        # Parcurgere în adâncime; listările nemodificate vin din index, restul din os.scandir
+        pending = [self.folder]
+        while pending and self.is_running:
+            root = pending.pop()
+            visited += 1
+            try:
+                hits, subdirs = self.scanner.scan_dir(root)
+            except OSError:
+                continue
+            batch.extend(hits)
+            discovered += len(subdirs)
+            pending.extend(reversed(subdirs))
+            
+            if time.monotonic() - last_emit >= BATCH_INTERVAL:
+                if batch:
+                    self.hits_found.emit(batch)
+                    batch = []
+                self.emit_progress(visited, discovered)
+                last_emit = time.monotonic()
+        
+        if batch:
+            self.hits_found.emit(batch)
+        self.emit_progress(visited, discovered)
+
+    def partition_listings(self, shards):
+        """Împarte indexul încărcat pe subarborii de pe primul nivel, pentru a-l trimite proceselor."""
+        prefix = os.path.join(self.folder, '')
+        partitions = {shard: {} for shard in shards}
+        for path, listing in self.index.cached.items():
+            if path.startswith(prefix):
+                shard = os.path.join(self.folder, path[len(prefix):].split(os.sep, 1)[0])
+                if shard in partitions:
+                    partitions[shard][path] = listing
+        return partitions
+
+    def scan_parallel(self):
+        """
+        Împarte arborele pe subfolderele de pe primul nivel între procese. Fiecare proces trimite
+        rezultatele pe parcurs, printr-o coadă, deci un subarbore mare nu le întârzie pe celelalte;
+        rândurile subarborilor se intercalează (tabelul poate fi sortat după cale).
+        """
+        try:
+            hits, shards = self.scanner.scan_dir(self.folder)
+        except OSError:
+            self.emit_progress(1, 1)
+            return
+        if hits:
+            self.hits_found.emit(hits)
+        
+        stop_event = multiprocessing.Event()
+        visited = multiprocessing.Value('q', 0)
+        discovered = multiprocessing.Value('q', 0)
+        results = multiprocessing.Queue()
+        partitions = self.partition_listings(shards)
+        executor = ProcessPoolExecutor(max_workers=self.processes, initializer=init_shard_worker,
+                                       initargs=(stop_event, visited, discovered, results))
+        try:
+            futures = [executor.submit(scan_shard, shard, self.allowed_chars, partitions[shard],
+                                       self.report_only, self.scanner.ignored_chars, self.use_index)
+                       for shard in shards]
+            done = set()
+            idle_after_exit = 0
+            last_emit = time.monotonic()
+            while len(done) < len(futures):
+                if not self.is_running:
+                    stop_event.set()
+                    break
+                try:
+                    kind, payload = results.get(timeout=BATCH_INTERVAL)
+                except queue.Empty:
+                    # Un proces oprit brusc nu mai trimite ('done', ...); după ce toate s-au
+                    # terminat, se mai așteaptă un interval pentru mesajele aflate încă pe drum
+                    if all(future.done() for future in futures):
+                        idle_after_exit += 1
+                        if idle_after_exit > 1:
+                            break
+                else:
+                    if kind == 'hits':
+                        self.hits_found.emit(payload)
+                    else:
+                        done.add(payload)
+                if time.monotonic() - last_emit >= BATCH_INTERVAL:
+                    self.emit_progress(1 + visited.value, 1 + len(shards) + discovered.value)
+                    last_emit = time.monotonic()
+            if self.is_running:
+                # Se adaugă doar agregatele subarborilor scanați complet; ceilalți sunt raportați
+                for shard, future in zip(shards, futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.scan_errors.append(f"{shard}: {str(e) or type(e).__name__}")
+                        continue
+                    if shard not in done:
+                        self.scan_errors.append(f"{shard}: rezultatele nu au ajuns complet")
+                        continue
+                    self.scanner.merge_shard(result)
+            self.emit_progress(1 + visited.value, 1 + len(shards) + discovered.value)
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(self):
+        if self.use_index:
+            self.index.load()
+        try:
+            if self.processes > 1:
+                self.scan_parallel()
+            else:
+                self.scan_serial()
+        except Exception as e:
+            # Și un pool de procese căzut (BrokenProcessPool) ajunge aici; finished trebuie emis oricum
+            self.scan_errors.append(f"Eroare la scanare: {str(e) or type(e).__name__}")
+        if self.use_index:
+            try:
+                self.index.save(self.folder, complete=self.is_running)
+                self.index_summary = self.index.summary()
+            except Exception as e:
+                self.index_summary = f"Eroare la salvarea indexului: {str(e)}"
+        self.finished.emit(not self.is_running)
+
+class ResultStore:
+    """
+    Stocare compactă a rezultatelor: calea, caracterele din afara setului implicit (ca șir)
+    și tipul intrării, în liste paralele. Un index caracter -> intrări permite refiltrarea
+    în memorie când se schimbă caracterele personalizate, fără o nouă scanare a discului.
+    """
+    def __init__(self):
+        self.allowed_extra = frozenset()
+        self.clear()
+
+    def clear(self):
+        self.paths = []
+        self.chars = []
+        self.is_dir = bytearray()
+        self.char_index = {}  # caracter -> lista indicilor intrărilor care îl conțin
+        self.visible = []     # indicii intrărilor care au cel puțin un caracter nepermis
+        self.files_count = 0
+        self.folders_count = 0
+
+    def __len__(self):
+        return len(self.visible)
+
+    def unusual(self, entry):
+        """Caracterele intrării care nu sunt permise de setul personalizat curent."""
+        return ''.join(char for char in self.chars[entry] if char not in self.allowed_extra)
+
+    def active_chars(self):
+        """Caracterele neobișnuite văzute la scanare și încă nepermise, sortate."""
+        return sorted(char for char in self.char_index if char not in self.allowed_extra)
+
+    def count_visible(self, hits):
+        """Câte intrări din lot vor fi vizibile (au cel puțin un caracter nepermis), înainte de adăugare."""
+        allowed_extra = self.allowed_extra
+        return sum(1 for _, chars, _ in hits if any(char not in allowed_extra for char in chars))
+
+    def add(self, hits):
+        """Adaugă un lot de (cale, caractere, este_folder); returnează caracterele noi, nepermise."""
+        new_chars = []
+        for path, chars, is_dir in hits:
+            entry = len(self.paths)
+            self.paths.append(path)
+            self.chars.append(chars)
+            self.is_dir.append(1 if is_dir else 0)
+            for char in chars:
+                if char not in self.char_index:
+                    self.char_index[char] = []
+                    if char not in self.allowed_extra:
+                        new_chars.append(char)
+                self.char_index[char].append(entry)
+            if self.unusual(entry):
+                self.show(entry)
+        return new_chars
+
+    def show(self, entry):
+        self.visible.append(entry)
+        if self.is_dir[entry]:
+            self.folders_count += 1
+        else:
+            self.files_count += 1
+
+    def refilter(self, allowed_extra):
+        """Recalculează intrările vizibile pentru un nou set de caractere permise suplimentar."""
+        self.allowed_extra = frozenset(allowed_extra)
+        entries = set()
+        for char in self.active_chars():
+            entries.update(self.char_index[char])
+        self.visible = []
+        self.files_count = 0
+        self.folders_count = 0
+        for entry in sorted(entries):
+            self.show(entry)
+
+class ResultsModel(QAbstractTableModel):
+    """Model pentru tabelul de rezultate; datele sunt citite din ResultStore doar pentru rândurile vizibile."""
+    HEADERS = ["Tip", "Caractere neobișnuite", "Cale"]
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        entry = self.store.visible[index.row()]
+        column = index.column()
+        if column == 0:
+            return "Folder" if self.store.is_dir[entry] else "Fișier"
+        if column == 1:
+            return ', '.join(self.store.unusual(entry))
+        return self.store.paths[entry]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def add_hits(self, hits):
+        """Adaugă un lot de rezultate; returnează caracterele noi apărute."""
+        count = self.store.count_visible(hits)
+        if not count:
+            return self.store.add(hits)
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        new_chars = self.store.add(hits)
+        self.endInsertRows()
+        return new_chars
+
+    def refilter(self, allowed_extra):
+        self.beginResetModel()
+        self.store.refilter(allowed_extra)
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
+
+class HistogramModel(QAbstractTableModel):
+    """Tabelul raportului per caracter; are câte un rând pentru fiecare caracter distinct."""
+    HEADERS = ["Caracter", "Cod", "Nume Unicode", "Categorie", "Apariții", "Fișiere", "Foldere", "Exemple"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.histogram = CharHistogram()
+        self.hidden_chars = frozenset()
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        value = self.rows[index.row()][CharHistogram.FIELDS[index.column()]]
+        if isinstance(value, list):
+            return '\n'.join(value) if role == Qt.ToolTipRole else ' | '.join(value)
+        return value
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def set_histogram(self, histogram, hidden_chars):
+        self.histogram = histogram
+        self.refilter(hidden_chars)
+
+    def refilter(self, hidden_chars):
+        self.beginResetModel()
+        self.hidden_chars = frozenset(hidden_chars)
+        self.rows = list(self.histogram.rows(self.hidden_chars))
+        self.endResetModel()
+
+class CharFilterProxy(QSortFilterProxyModel):
+    """Sortare și filtrare după un singur caracter neobișnuit."""
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.filter_char = None
+
+    def set_filter_char(self, char):
+        self.filter_char = char
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.filter_char is None:
+            return True
+        return self.filter_char in self.store.chars[self.store.visible[source_row]]
+
 class AddCharacterDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -101,20 +744,104 @@ class FileScanner(QMainWindow):
         
         left_layout.addWidget(self.stats_frame)
         
-        # Buton pentru începerea scanării
+        # Butoane pentru începerea și anularea scanării
+        scan_buttons_layout = QHBoxLayout()
+        
         self.scan_btn = QPushButton("🔍 Start Scanare", self)
         self.scan_btn.clicked.connect(self.start_scan)
         self.scan_btn.setEnabled(False)
         self.scan_btn.setMinimumHeight(40)
-        left_layout.addWidget(self.scan_btn)
+        scan_buttons_layout.addWidget(self.scan_btn)
+        
+        self.cancel_btn = QPushButton("⏹ Anulează", self)
+        self.cancel_btn.clicked.connect(self.cancel_scan)
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.setMinimumHeight(40)
+        scan_buttons_layout.addWidget(self.cancel_btn)
+        
+        left_layout.addLayout(scan_buttons_layout)
+        
+        # Indexul listărilor: re-listează doar folderele modificate de la scanarea anterioară
+        self.use_index_check = QCheckBox("Folosește indexul salvat (re-listează doar folderele modificate)", self)
+        self.use_index_check.setChecked(False)
+        self.use_index_check.setToolTip(
+            "Un folder este re-listat doar dacă data lui de modificare s-a schimbat (pe Linux/macOS și ctime-ul).\n"
+            "Pe Windows, după o rulare folderdate.py (care rescrie data folderelor) o redenumire\n"
+            "poate rămâne nevăzută; dezactivați indexul pentru o scanare completă după folderdate.py.")
+        left_layout.addWidget(self.use_index_check)
+        
+        # Scanare paralelă: subfolderele de pe primul nivel sunt împărțite între procese
+        processes_layout = QHBoxLayout()
+        processes_layout.addWidget(QLabel("Procese de scanare (1 = un singur fir):", self))
+        self.processes_spin = QSpinBox(self)
+        self.processes_spin.setRange(1, max(1, os.cpu_count() or 1) * 2)
+        self.processes_spin.setValue(1)
+        processes_layout.addWidget(self.processes_spin)
+        left_layout.addLayout(processes_layout)
+        
+        # Progres: foldere vizitate din cele descoperite până acum
+        self.progress_bar = QProgressBar(self)
+        left_layout.addWidget(self.progress_bar)
+        self.progress_label = QLabel("", self)
+        left_layout.addWidget(self.progress_label)
         
         # Zona de rezultate
+        results_header_layout = QHBoxLayout()
         results_label = QLabel("Rezultate scanare:", self)
-        left_layout.addWidget(results_label)
+        results_header_layout.addWidget(results_label)
+        
+        # Filtru după caracter
+        self.char_filter = QComboBox(self)
+        self.char_filter.addItem("Toate caracterele", None)
+        self.char_filter.currentIndexChanged.connect(self.filter_changed)
+        results_header_layout.addWidget(self.char_filter)
+        left_layout.addLayout(results_header_layout)
         
-        self.results = QTextEdit(self)
-        self.results.setReadOnly(True)
-        left_layout.addWidget(self.results)
+        # Tabel virtualizat: se randează doar rândurile vizibile
+        self.store = ResultStore()
+        self.results_model = ResultsModel(self.store, self)
+        self.results_proxy = CharFilterProxy(self.store, self)
+        self.results_proxy.setSourceModel(self.results_model)
+        self.results = QTableView(self)
+        self.results.setModel(self.results_proxy)
+        self.results.setSortingEnabled(True)
+        self.results.sortByColumn(-1, Qt.AscendingOrder)
+        self.results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results.verticalHeader().setVisible(False)
+        self.results.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.results.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.results.horizontalHeader().setStretchLastSection(True)
+        self.results.setColumnWidth(0, 80)
+        self.results.setColumnWidth(1, 200)
+        
+        # Raportul per caracter (histogramă), calculat în aceeași trecere cu scanarea
+        self.histogram_model = HistogramModel(self)
+        self.histogram_view = QTableView(self)
+        self.histogram_view.setModel(self.histogram_model)
+        self.histogram_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.histogram_view.verticalHeader().setVisible(False)
+        self.histogram_view.horizontalHeader().setStretchLastSection(True)
+        
+        self.results_tabs = QTabWidget(self)
+        self.results_tabs.addTab(self.results, "Rezultate")
+        self.results_tabs.addTab(self.histogram_view, "Raport pe caractere")
+        left_layout.addWidget(self.results_tabs)
+        
+        # Modul raport și exportul histogramei
+        report_layout = QHBoxLayout()
+        self.report_only_check = QCheckBox("Mod raport (doar histogramă, memorie constantă)", self)
+        report_layout.addWidget(self.report_only_check)
+        self.export_btn = QPushButton("💾 Exportă raport", self)
+        self.export_btn.clicked.connect(self.export_report)
+        self.export_btn.setEnabled(False)
+        report_layout.addWidget(self.export_btn)
+        left_layout.addLayout(report_layout)
+        
+        # Mesaje de stare (configurație, scanare)
+        self.status_label = QLabel("", self)
+        self.status_label.setWordWrap(True)
+        left_layout.addWidget(self.status_label)
         
         main_layout.addLayout(left_layout, stretch=2)
         
@@ -164,6 +891,9 @@ class FileScanner(QMainWindow):
         main_layout.addLayout(right_layout, stretch=1)
         
         self.selected_folder = None
+        self.scan_worker = None
+        # Numărătorile ultimei scanări în modul raport (None după o scanare normală)
+        self.report_counts = None
         
     def validate_selected(self):
         if not self.chars_list.selectedItems():
@@ -176,24 +906,24 @@ class FileScanner(QMainWindow):
         self.update_chars_list()
         self.save_config()
         
-        # Reafișează rezultatele cu caracterele validate
-        if self.selected_folder:
-            self.start_scan()
+        # Reafișează rezultatele cu caracterele validate, fără a rescana discul
+        self.refilter_results()
     
-    def update_statistics(self, unusual_chars):
-        files_count = 0
-        folders_count = 0
-        
-        for path in unusual_chars.keys():
-            if os.path.isfile(path):
-                files_count += 1
-            else:
-                folders_count += 1
+    def update_statistics(self, files_count=None, folders_count=None):
+        # Numărătorile sunt ținute de ResultStore (sau de scanare, în modul raport),
+        # fără acces suplimentar la disc
+        if files_count is None:
+            files_count = self.store.files_count
+            folders_count = self.store.folders_count
                 
         self.files_count.setText(f"Fișiere cu caractere neobișnuite: {files_count}")
         self.folders_count.setText(f"Foldere cu caractere neobișnuite: {folders_count}")
         self.total_count.setText(f"Total elemente problematice: {files_count + folders_count}")
     
+    def update_report_counts(self, files_count, folders_count):
+        self.report_counts = (files_count, folders_count)
+        self.update_statistics(files_count, folders_count)
+    
     def update_chars_list(self):
         self.chars_list.clear()
         for char in sorted(self.custom_chars):
@@ -212,6 +942,7 @@ class FileScanner(QMainWindow):
                 self.allowed_chars = self.default_chars | self.custom_chars
                 self.update_chars_list()
                 self.save_config()
+                self.refilter_results()
     
     def remove_character(self):
         current_item = self.chars_list.currentItem()
@@ -221,6 +952,28 @@ class FileScanner(QMainWindow):
             self.allowed_chars = self.default_chars | self.custom_chars
             self.update_chars_list()
             self.save_config()
+            self.refilter_results()
+    
+    def refilter_results(self):
+        """Refiltrează în memorie rezultatele ultimei scanări după caracterele personalizate curente."""
+        self.results_model.refilter(self.custom_chars)
+        self.histogram_model.refilter(self.custom_chars)
+        current_char = self.char_filter.currentData()
+        self.reset_char_filter()
+        for char in self.store.active_chars():
+            self.char_filter.addItem(f"{char} (U+{ord(char):04X})", char)
+        if current_char is not None:
+            index = self.char_filter.findData(current_char)
+            if index > 0:
+                self.char_filter.setCurrentIndex(index)
+        if self.report_counts is None:
+            self.update_statistics()
+        else:
+            # Modul raport nu păstrează rezultatele individuale, deci numărătorile nu pot fi
+            # recalculate în memorie; rămân cele calculate cu caracterele de la scanare
+            self.update_statistics(*self.report_counts)
+            self.results_message("Mod raport: numărătorile corespund caracterelor permise la scanare; "
+                                 "rescanați pentru a le actualiza. Raportul pe caractere este actualizat.")
     
     def load_config(self):
         try:
@@ -246,8 +999,8 @@ class FileScanner(QMainWindow):
             QMessageBox.warning(self, "Eroare", f"Eroare la salvarea configurației: {str(e)}")
     
     def results_message(self, message):
-        if hasattr(self, 'results'):
-            self.results.append(message)
+        if hasattr(self, 'status_label'):
+            self.status_label.setText(message)
         else:
             print(message)
     
@@ -258,46 +1011,110 @@ class FileScanner(QMainWindow):
             self.folder_label.setText(f"Folder selectat: {folder}")
             self.scan_btn.setEnabled(True)
     
-    def scan_files(self, folder):
-        unusual_chars = {}
-        
-        for root, dirs, files in os.walk(folder):
-            # Verifică numele directoarelor
-            for dir_name in dirs:
-                unusual = set(dir_name) - self.allowed_chars
-                if unusual:
-                    full_path = os.path.join(root, dir_name)
-                    unusual_chars[full_path] = unusual
-            
-            # Verifică numele fișierelor
-            for file_name in files:
-                unusual = set(file_name) - self.allowed_chars
-                if unusual:
-                    full_path = os.path.join(root, file_name)
-                    unusual_chars[full_path] = unusual
-        
-        return unusual_chars
-    
     def start_scan(self):
         if not self.selected_folder:
             return
         
-        self.results.clear()
-        self.results.append("Scanare în curs...\n")
+        self.stop_scan()
         
-        unusual_chars = self.scan_files(self.selected_folder)
+        self.results_model.clear()
+        self.report_counts = (0, 0) if self.report_only_check.isChecked() else None
+        self.store.allowed_extra = frozenset(self.custom_chars)
+        self.reset_char_filter()
+        self.results_message("Scanare în curs...")
+        self.update_statistics()
+        self.progress_bar.setValue(0)
+        self.progress_label.setText("")
         
-        if not unusual_chars:
-            self.results.append("Nu s-au găsit caractere neobișnuite!")
-            self.update_statistics({})
+        # Se caută față de setul implicit, ca setul personalizat să poată fi schimbat fără rescanare
+        self.histogram_model.set_histogram(CharHistogram(), self.custom_chars)
+        self.export_btn.setEnabled(False)
+        self.scan_worker = ScanWorker(self.selected_folder, self.default_chars,
+                                      self.use_index_check.isChecked(),
+                                      self.report_only_check.isChecked(), self.custom_chars,
+                                      self.processes_spin.value())
+        self.scan_worker.hits_found.connect(self.add_hits)
+        self.scan_worker.report_counts.connect(self.update_report_counts)
+        self.scan_worker.progress.connect(self.update_progress)
+        self.scan_worker.finished.connect(self.scan_finished)
+        self.scan_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.scan_worker.start()
+    
+    def cancel_scan(self):
+        if self.scan_worker and self.scan_worker.isRunning():
+            self.scan_worker.stop()
+            self.cancel_btn.setEnabled(False)
+    
+    def stop_scan(self):
+        """Oprește scanarea în curs (dacă există) și așteaptă terminarea firului."""
+        if self.scan_worker:
+            self.scan_worker.stop()
+            self.scan_worker.wait()
+            self.scan_worker = None
+    
+    def add_hits(self, hits):
+        for char in self.results_model.add_hits(hits):
+            self.char_filter.addItem(f"{char} (U+{ord(char):04X})", char)
+        self.update_statistics()
+    
+    def reset_char_filter(self):
+        self.char_filter.blockSignals(True)
+        self.char_filter.clear()
+        self.char_filter.addItem("Toate caracterele", None)
+        self.char_filter.blockSignals(False)
+        self.results_proxy.set_filter_char(None)
+    
+    def filter_changed(self, index):
+        self.results_proxy.set_filter_char(self.char_filter.itemData(index))
+    
+    def update_progress(self, visited, discovered):
+        self.progress_bar.setValue(int(visited / discovered * 100) if discovered else 0)
+        self.progress_label.setText(f"Foldere vizitate: {visited} din {discovered} descoperite")
+    
+    def scan_finished(self, cancelled):
+        # Semnalul poate sosi după ce stop_scan() a renunțat la fir (sau după ce a pornit altă scanare)
+        worker = self.sender()
+        if worker is None or worker is not self.scan_worker:
             return
-        
-        self.results.append("Caractere neobișnuite găsite:\n")
-        for path, chars in unusual_chars.items():
-            self.results.append(f"În: {path}")
-            self.results.append(f"Caractere neobișnuite: {', '.join(chars)}\n")
-            
-        self.update_statistics(unusual_chars)
+        self.scan_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.histogram_model.set_histogram(worker.histogram, self.custom_chars)
+        self.export_btn.setEnabled(True)
+        if worker.report_only:
+            self.results_tabs.setCurrentWidget(self.histogram_view)
+        if cancelled:
+            message = "Scanare anulată!"
+        elif worker.report_only:
+            message = f"Raport complet: {self.histogram_model.rowCount()} caractere neobișnuite distincte."
+        elif len(self.store) == 0:
+            message = "Nu s-au găsit caractere neobișnuite!"
+        else:
+            message = f"Scanare completă: {len(self.store)} elemente cu caractere neobișnuite."
+        if worker.scan_errors:
+            message += f"\nSubarbori nescanați complet ({len(worker.scan_errors)}):\n"
+            message += '\n'.join(worker.scan_errors[:5])
+        if worker.index_summary:
+            message += f"\n{worker.index_summary}"
+        self.results_message(message)
+    
+    def export_report(self):
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exportă raport", "raport_caractere.csv", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        try:
+            if path.lower().endswith('.json') or selected_filter.startswith('JSON'):
+                self.histogram_model.histogram.export_json(path, self.custom_chars)
+            else:
+                self.histogram_model.histogram.export_csv(path, self.custom_chars)
+            self.results_message(f"Raport exportat în {path}")
+        except Exception as e:
+            QMessageBox.warning(self, "Eroare", f"Eroare la exportul raportului: {str(e)}")
+    
+    def closeEvent(self, event):
+        self.stop_scan()
+        event.accept()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -1,131 +1,691 @@
 import sys
 import os
 import json
+import re
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from logging.handlers import QueueHandler, QueueListener
 from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QVBoxLayout, 
-                           QLabel, QFileDialog, QProgressBar, QTextEdit, QHBoxLayout, 
-                           QLineEdit, QScrollArea, QWidget, QGridLayout)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
-from PyQt5.QtGui import QCloseEvent, QTextCursor
+                           QLabel, QFileDialog, QProgressBar, QListView, QHBoxLayout, 
+                           QLineEdit, QScrollArea, QWidget, QGridLayout, QCheckBox,
+                           QSpinBox)
+from PyQt5.QtCore import QThread, pyqtSignal, Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QCloseEvent, QColor
 import subprocess
 
-class ClickableTextEdit(QTextEdit):
-    def __init__(self):
-        super().__init__()
-        self.setReadOnly(True)
-        self.setTextInteractionFlags(
-            Qt.TextSelectableByMouse | 
-            Qt.TextSelectableByKeyboard | 
-            Qt.LinksAccessibleByMouse
-        )
-        self.setMouseTracking(True)
-
-    def mousePressEvent(self, event):
-        cursor = self.cursorForPosition(event.pos())
-        fragment = cursor.charFormat().anchorHref()
-        if fragment.startswith('file://'):
-            path = fragment.replace('file://', '')
-            directory = os.path.dirname(path)
-            if os.path.exists(directory):
-                if sys.platform == 'win32':
-                    os.startfile(directory)
-                elif sys.platform == 'darwin':
-                    subprocess.run(['open', directory])
-                else:
-                    subprocess.run(['xdg-open', directory])
-            event.accept()
+logger = logging.getLogger(__name__)
+# Logul complet merge doar în fișier (vezi start_file_log), nu și în consolă
+logger.propagate = False
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.NullHandler())
+
+# Fișierul cu logul complet al ultimei rulări
+LOG_FILE = 'dezdiacriticator_log.txt'
+# Intervalul (secunde) la care firul de lucru trimite loturile de mesaje și progresul către interfață
+LOG_FLUSH_INTERVAL = 0.25
+# Numărul maxim de mesaje păstrate în fereastra de log (restul sunt doar în LOG_FILE)
+LOG_VIEW_LINES = 5000
+
+def open_folder(directory):
+    """Deschide folderul în managerul de fișiere al sistemului."""
+    if not os.path.exists(directory):
+        return
+    if sys.platform == 'win32':
+        os.startfile(directory)
+    elif sys.platform == 'darwin':
+        subprocess.run(['open', directory])
+    else:
+        subprocess.run(['xdg-open', directory])
+
+def start_file_log(path=LOG_FILE):
+    """
+    Pornește scrierea logului complet în fișier pe un fir separat (QueueListener),
+    astfel încât firul de lucru doar pune mesajele într-o coadă.
+    """
+    file_handler = logging.FileHandler(path, mode='w', encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    log_queue = queue.Queue()
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    return listener, queue_handler
+
+def stop_file_log(file_log):
+    """Oprește scrierea în fișier după ce toate mesajele din coadă au fost scrise."""
+    listener, queue_handler = file_log
+    logger.removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+class LogBuffer:
+    """
+    Buffer de log în firul de lucru: fiecare intrare (nivel, mesaj, folder) este trimisă în
+    fișier prin logger și livrată interfeței în loturi, de câteva ori pe secundă.
+    """
+    def __init__(self, emit_batch, interval=LOG_FLUSH_INTERVAL):
+        self.emit_batch = emit_batch
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.pending = []
+        self.last_flush = time.monotonic()
+
+    def add(self, level, message, folder=None):
+        logger.log(level, f'{message} [{folder}]' if folder else message)
+        with self.lock:
+            self.pending.append((level, message, folder))
+        self.flush_if_due()
+
+    def due(self):
+        return time.monotonic() - self.last_flush >= self.interval
+
+    def flush_if_due(self):
+        if self.due():
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, []
+            self.last_flush = time.monotonic()
+        if batch:
+            self.emit_batch(batch)
+
+class LogModel(QAbstractListModel):
+    """
+    Model circular pentru fereastra de log: păstrează doar ultimele max_lines intrări.
+    Textul legăturii către folder este construit doar pentru rândurile cerute de view
+    (cele vizibile); folderul se deschide cu dublu-clic.
+    """
+    def __init__(self, max_lines=LOG_VIEW_LINES, parent=None):
+        super().__init__(parent)
+        self.entries = deque(maxlen=max_lines)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        level, message, folder = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return f'{message}    [Deschide folder]' if folder else message
+        if role == Qt.ForegroundRole and level >= logging.ERROR:
+            return QColor('red')
+        if role == Qt.ToolTipRole and folder:
+            return f'Dublu-clic pentru a deschide: {folder}'
+        if role == Qt.UserRole:
+            return folder
+        return None
+
+    def append_entries(self, entries):
+        """
+        Adaugă intrările noi cu notificări de inserare; cele mai vechi, peste limită, sunt scoase
+        cu notificări de ștergere, deci view-ul își păstrează poziția și selecția.
+        """
+        entries = list(entries)[-self.entries.maxlen:]
+        if not entries:
             return
-        super().mousePressEvent(event)
+        overflow = len(self.entries) + len(entries) - self.entries.maxlen
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.entries.popleft()
+            self.endRemoveRows()
+        first = len(self.entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries.extend(entries)
+        self.endInsertRows()
 
-    def mouseMoveEvent(self, event):
-        cursor = self.cursorForPosition(event.pos())
-        if cursor.charFormat().anchorHref():
-            self.viewport().setCursor(Qt.PointingHandCursor)
-        else:
-            self.viewport().setCursor(Qt.IBeamCursor)
-        super().mouseMoveEvent(event)
+    def append_text(self, message, level=logging.INFO):
+        self.append_entries([(level, message, None)])
+
+    def clear(self):
+        self.beginResetModel()
+        self.entries.clear()
+        self.endResetModel()
+
+# Numărul maxim de nume memorate de ReplacementMatcher (numele se repetă des între foldere)
+NAME_CACHE_SIZE = 100000
+
+class ReplacementMatcher:
+    """
+    Regulile de înlocuire compilate o singură dată pe rulare.
+    Regulile consecutive care nu se pot influența între ele (textele căutate nu au caractere
+    comune cu textele căutate sau rezultate ale regulilor anterioare din grup) sunt reunite
+    într-o singură expresie regulată cu alternanță și un dicționar de înlocuiri. Rezultatul
+    este identic cu aplicarea regulilor una după alta cu str.replace, în ordinea din tabel.
+    """
+    def __init__(self, replacements, cache_size=NAME_CACHE_SIZE):
+        rules = [(from_text, to_text) for from_text, to_text in replacements
+                 if from_text and to_text]
+        self.stages = []
+        stage = []
+        for from_text, to_text in rules:
+            if stage and not self.can_join(stage, from_text):
+                self.stages.append(self.compile_stage(stage))
+                stage = []
+            stage.append((from_text, to_text))
+        if stage:
+            self.stages.append(self.compile_stage(stage))
+        
+        # Un nume fără primul caracter al vreunei reguli nu poate fi modificat
+        self.first_chars = frozenset(from_text[0] for from_text, _ in rules)
+        self.ascii_safe = all(not from_text.isascii() for from_text, _ in rules)
+        self.cache_size = cache_size
+        self.cache = {}
+
+    @staticmethod
+    def can_join(stage, from_text):
+        chars = set(from_text)
+        return all(chars.isdisjoint(previous_from) and chars.isdisjoint(previous_to)
+                   for previous_from, previous_to in stage)
+
+    @staticmethod
+    def compile_stage(stage):
+        table = dict(stage)
+        pattern = re.compile('|'.join(re.escape(from_text) for from_text, _ in stage))
+        return pattern, table
+
+    def apply(self, name):
+        for pattern, table in self.stages:
+            name = pattern.sub(lambda match: table[match.group(0)], name)
+        return name
+
+    def fix_name(self, name):
+        """Returnează (nume_nou, a_fost_modificat)."""
+        if (self.ascii_safe and name.isascii()) or self.first_chars.isdisjoint(name):
+            return name, False
+        new_name = self.cache.get(name)
+        if new_name is None:
+            new_name = self.apply(name)
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[name] = new_name
+        return new_name, new_name != name
+
+class RenameOp:
+    """O redenumire planificată: numele vechi și cel nou, în același folder părinte."""
+    __slots__ = ('root', 'old_name', 'new_name', 'is_dir')
+    
+    def __init__(self, root, old_name, new_name, is_dir):
+        self.root = root
+        self.old_name = old_name
+        self.new_name = new_name
+        self.is_dir = is_dir
+    
+    @property
+    def old_path(self):
+        return os.path.join(self.root, self.old_name)
+    
+    @property
+    def new_path(self):
+        return os.path.join(self.root, self.new_name)
+
+def order_chains(accepted):
+    """
+    Ordonează redenumirile unui folder astfel încât un nume să fie eliberat înainte să fie
+    ocupat (a -> b rulează după b -> c). Returnează (ordonate, cele_din_cicluri).
+    """
+    sources = {os.path.normcase(op.old_name): op for op in accepted}
+    ordered = []
+    placed = set()
+    cyclic = []
+    for op in accepted:
+        chain = []
+        current = op
+        while current is not None and id(current) not in placed and current not in chain:
+            chain.append(current)
+            blocker = sources.get(os.path.normcase(current.new_name))
+            current = blocker if blocker is not current else None
+        if current is not None and id(current) not in placed:
+            # Lanțul s-a întors la el însuși (ex. schimb a <-> b): nu există o ordine validă
+            cyclic.extend(member for member in chain[chain.index(current):])
+            chain = chain[:chain.index(current)]
+        for member in reversed(chain):
+            placed.add(id(member))
+            ordered.append(member)
+        placed.update(id(member) for member in cyclic)
+    return ordered, cyclic
+
+def plan_directory(matcher, root, dirs, files):
+    """
+    Planifică redenumirile dintr-un singur folder comparând numele fraților doar în memorie,
+    fără apeluri către disc. Cheile folosesc os.path.normcase (pe Windows 'A' și 'a' sunt
+    același nume). Returnează (operații_ordonate, conflicte), unde conflictele sunt perechi
+    (operație, motiv) care rămân nerealizate.
+    """
+    staying = set()
+    pending = []
+    for names, is_dir in ((files, False), (dirs, True)):
+        for name in names:
+            new_name, was_modified = matcher.fix_name(name)
+            if was_modified:
+                pending.append(RenameOp(root, name, new_name, is_dir))
+            else:
+                staying.add(os.path.normcase(name))
+    
+    conflicts = []
+    while True:
+        claimed = {}
+        accepted = []
+        rejected = []
+        for op in pending:
+            key = os.path.normcase(op.new_name)
+            if key in staying:
+                rejected.append((op, 'numele nou există deja în folder'))
+            elif key in claimed:
+                rejected.append((op, f'același nume nou ca {claimed[key].old_name}'))
+            else:
+                claimed[key] = op
+                accepted.append(op)
+        if not rejected:
+            ordered, cyclic = order_chains(accepted)
+            if not cyclic:
+                return ordered, conflicts
+            rejected = [(op, 'schimb circular de nume') for op in cyclic]
+        
+        # Elementele respinse își păstrează numele, care poate bloca alte redenumiri
+        conflicts.extend(rejected)
+        rejected_ids = set()
+        for op, _ in rejected:
+            staying.add(os.path.normcase(op.old_name))
+            rejected_ids.add(id(op))
+        pending = [op for op in pending if id(op) not in rejected_ids]
+
+# Numărul implicit de fire care redenumesc în paralel foldere independente (1 = pe un singur fir)
+DEFAULT_RENAME_WORKERS = 8
+
+# Jurnalul redenumirilor (în folderul curent, ca și setările), folosit pentru reluare și anulare
+JOURNAL_FILE = 'rename_journal.jsonl'
+# Jurnalul este scris pe disc (flush + fsync) la fiecare N intrări sau după câteva secunde
+JOURNAL_FLUSH_EVERY = 500
+JOURNAL_FLUSH_INTERVAL = 2.0
+
+class RenameJournal:
+    """
+    Jurnal JSONL doar-adăugare: antetul rulării, operațiile planificate (indexul este poziția
+    în plan), marcajul de plan complet și câte o linie pentru fiecare redenumire realizată.
+    Scrierile sunt grupate și sincronizate pe disc pe loturi, nu după fiecare intrare; la o
+    întrerupere se pierd cel mult ultimele intrări 'done', pe care reluarea le recunoaște.
+    """
+    def __init__(self, path, flush_every=JOURNAL_FLUSH_EVERY, flush_interval=JOURNAL_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.file = None
+        self.unflushed = 0
+        self.last_flush = 0.0
+        self.next_index = 0
+    
+    def start(self, directory, replacements):
+        """Începe un jurnal nou pentru o rulare (jurnalul anterior este înlocuit)."""
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.last_flush = time.monotonic()
+        self.write({'type': 'start', 'root': directory, 'replacements': replacements})
+    
+    def reopen(self, next_index, valid_size):
+        """Continuă un jurnal existent (reluare sau anulare), după ultima linie completă."""
+        os.truncate(self.path, valid_size)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.last_flush = time.monotonic()
+        self.next_index = next_index
+    
+    def record_ops(self, ops):
+        """Adaugă operații la plan și returnează indexurile lor."""
+        first = self.next_index
+        for op in ops:
+            self.write({'type': 'op', 'root': op.root, 'old': op.old_name,
+                        'new': op.new_name, 'dir': op.is_dir})
+        self.next_index += len(ops)
+        return range(first, self.next_index)
+    
+    def record_planned(self):
+        self.write({'type': 'planned'})
+        self.flush()
+    
+    def record_done(self, index):
+        self.write({'type': 'done', 'i': index})
+    
+    def record_undo_started(self):
+        self.write({'type': 'undo'})
+        self.flush()
+    
+    def record_undone(self, index):
+        self.write({'type': 'undone', 'i': index})
+    
+    def write(self, entry):
+        self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.unflushed += 1
+        if (self.unflushed >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        if self.file is None or not self.unflushed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unflushed = 0
+        self.last_flush = time.monotonic()
+    
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+    
+    @staticmethod
+    def load(path):
+        """
+        Citește jurnalul fără să parcurgă din nou arborele. Returnează None dacă lipsește,
+        altfel un dicționar cu: root, replacements, ops, done, undone, complete, undo și
+        valid_size (lungimea în octeți a părții citibile, de la care se poate continua).
+        """
+        if not os.path.exists(path):
+            return None
+        state = {'root': None, 'replacements': [], 'ops': [], 'done': set(), 'undone': set(),
+                 'complete': False, 'undo': False, 'valid_size': 0}
+        with open(path, 'rb') as f:
+            for raw_line in f:
+                # Ultima linie poate fi trunchiată dacă rularea a fost întreruptă
+                if not raw_line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(raw_line)
+                except ValueError:
+                    break
+                state['valid_size'] += len(raw_line)
+                kind = entry.get('type')
+                if kind == 'op':
+                    state['ops'].append(RenameOp(entry['root'], entry['old'], entry['new'], entry['dir']))
+                elif kind == 'done':
+                    state['done'].add(entry['i'])
+                elif kind == 'undone':
+                    state['undone'].add(entry['i'])
+                elif kind == 'planned':
+                    state['complete'] = True
+                elif kind == 'undo':
+                    state['undo'] = True
+                elif kind == 'start':
+                    state['root'] = entry['root']
+                    state['replacements'] = entry['replacements']
+        return state
 
 class WorkerThread(QThread):
     progress = pyqtSignal(int)
-    log = pyqtSignal(str)
+    dirs_processed = pyqtSignal(int)
+    plan_ready = pyqtSignal(int, int)
+    log_batch = pyqtSignal(list)
     finished = pyqtSignal(int, int)
     
-    def __init__(self, directory, replacements):
+    def __init__(self, directory, replacements, streaming=False, dry_run=False,
+                 action='run', journal_file=JOURNAL_FILE, rename_workers=1):
         super().__init__()
         self.directory = directory
         self.replacements = replacements
-        self.files_processed = 0
-        self.total_files = 0
+        self.matcher = ReplacementMatcher(replacements)
+        # streaming=True: planificare și redenumire folder cu folder, fără enumerare prealabilă
+        self.streaming = streaming
+        # dry_run=True: doar se afișează planul, nimic nu este redenumit
+        self.dry_run = dry_run
+        # action: 'run' (rulare nouă), 'resume' (continuă din jurnal) sau 'undo' (anulează din jurnal)
+        self.action = action
+        # Folderele independente din plan sunt redenumite pe rename_workers fire
+        self.rename_workers = max(1, rename_workers)
+        self.journal = RenameJournal(journal_file) if journal_file and not dry_run else None
+        self.log_buffer = LogBuffer(self.log_batch.emit)
+        self.last_progress = -1
+        self.ops_applied = 0
+        self.total_ops = 0
+        self.conflicts = 0
         self.modified_files = 0
         self.modified_dirs = 0
     
     def fix_name(self, name):
-        original = name
-        for from_text, to_text in self.replacements:
-            if from_text and to_text:
-                name = name.replace(from_text, to_text)
-        return name, name != original
-    
-    def count_files(self, directory):
-        count = 0
-        for root, dirs, files in os.walk(directory):
-            count += len(files)
-        return count
+        return self.matcher.fix_name(name)
+    
+    def enumerate_tree(self, directory):
+        """Faza unică de enumerare: listările folderelor, de jos în sus, păstrate în memorie."""
+        return list(os.walk(directory, topdown=False))
+    
+    def plan_tree(self, listing):
+        """
+        Planul complet, în ordinea listării de jos în sus: redenumirile din interiorul unui
+        folder apar înaintea redenumirii folderului însuși, deci căile rămân valide la aplicare.
+        """
+        plan = []
+        for root, dirs, files in listing:
+            ops, conflicts = plan_directory(self.matcher, root, dirs, files)
+            self.report_conflicts(conflicts)
+            plan.extend(ops)
+        return plan
     
     def run(self):
-        self.total_files = self.count_files(self.directory)
+        try:
+            if self.action == 'run':
+                self.run_new()
+            else:
+                self.run_from_journal()
+        finally:
+            if self.journal:
+                self.journal.close()
+            self.log_buffer.flush()
         
-        for root, dirs, files in os.walk(self.directory, topdown=False):
-            for file_name in files:
-                old_path = os.path.join(root, file_name)
-                new_name, was_modified = self.fix_name(file_name)
-                
-                if was_modified:
-                    try:
-                        new_path = os.path.join(root, new_name)
-                        os.rename(old_path, new_path)
-                        self.modified_files += 1
-                        self.log.emit(
-                            f'Redenumit: {file_name} -> {new_name}<br>'
-                            f'<a href="file://{new_path}" style="color: blue; text-decoration: underline;">Deschide folder</a><br>'
-                        )
-                    except Exception as e:
-                        error_folder = os.path.dirname(old_path)
-                        error_message = str(e)
-                        self.log.emit(
-                            f'<span style="color: red;">Eroare: {error_message}</span><br>'
-                            f'<a href="file://{error_folder}" style="color: blue; text-decoration: underline;">Deschide folder cu problema</a><br>'
-                            f'Fișier: {old_path} -> {new_path}<br>'
-                            f'------------------------<br>'
-                        )
-                
-                self.files_processed += 1
-                progress = int((self.files_processed / self.total_files) * 100)
-                self.progress.emit(progress)
-            
-            for dir_name in dirs:
-                old_path = os.path.join(root, dir_name)
-                new_name, was_modified = self.fix_name(dir_name)
-                
-                if was_modified:
-                    try:
-                        new_path = os.path.join(root, new_name)
-                        os.rename(old_path, new_path)
-                        self.modified_dirs += 1
-                        self.log.emit(
-                            f'Director redenumit: {dir_name} -> {new_name}<br>'
-                            f'<a href="file://{new_path}" style="color: blue; text-decoration: underline;">Deschide folder</a><br>'
-                        )
-                    except Exception as e:
-                        error_folder = os.path.dirname(old_path)
-                        error_message = str(e)
-                        self.log.emit(
-                            f'<span style="color: red;">Eroare la director: {error_message}</span><br>'
-                            f'<a href="file://{error_folder}" style="color: blue; text-decoration: underline;">Deschide folder cu problema</a><br>'
-                            f'Director: {old_path} -> {new_path}<br>'
-                            f'------------------------<br>'
-                        )
-
         self.finished.emit(self.modified_files, self.modified_dirs)
+    
+    def run_new(self):
+        if self.journal:
+            self.journal.start(self.directory, self.replacements)
+        if self.streaming:
+            # Arbori prea mari pentru memorie: progresul se măsoară în foldere procesate
+            index = 0
+            for index, (root, dirs, files) in enumerate(os.walk(self.directory, topdown=False), 1):
+                ops, conflicts = plan_directory(self.matcher, root, dirs, files)
+                self.report_conflicts(conflicts)
+                for op_index, op in zip(self.record_ops(ops), ops):
+                    if self.apply_op(op) and self.journal:
+                        self.journal.record_done(op_index)
+                # Numărul de foldere este trimis doar la intervalul loturilor de log
+                if self.log_buffer.due():
+                    self.log_buffer.flush()
+                    self.dirs_processed.emit(index)
+            self.dirs_processed.emit(index)
+            if self.journal:
+                self.journal.record_planned()
+        else:
+            plan = self.plan_tree(self.enumerate_tree(self.directory))
+            indexes = self.record_ops(plan)
+            if self.journal:
+                self.journal.record_planned()
+            self.total_ops = len(plan)
+            self.plan_ready.emit(self.total_ops, self.conflicts)
+            self.apply_plan(zip(indexes, plan))
+    
+    def record_ops(self, ops):
+        if self.journal:
+            return self.journal.record_ops(ops)
+        return range(len(ops))
+    
+    def run_from_journal(self):
+        """Reluarea sau anularea unei rulări anterioare, direct din jurnal, fără parcurgerea arborelui."""
+        state = RenameJournal.load(self.journal.path) if self.journal else None
+        if state is None:
+            self.log_buffer.add(logging.ERROR, 'Nu există un jurnal al unei rulări anterioare.')
+            return
+        self.directory = state['root']
+        ops = state['ops']
+        completed = state['done'] - state['undone']
+        
+        if self.action == 'undo' or state['undo']:
+            # Redenumirile realizate se inversează în ordine inversă: folderele părinte
+            # își recapătă numele înaintea conținutului lor
+            self.action = 'undo'
+            self.journal.reopen(len(ops), state['valid_size'])
+            if not state['undo']:
+                self.journal.record_undo_started()
+            plan = [(index, RenameOp(ops[index].root, ops[index].new_name, ops[index].old_name, ops[index].is_dir))
+                    for index in sorted(completed, reverse=True)]
+            self.log_buffer.add(logging.INFO, f'Anulare: {len(plan)} redenumiri de inversat din jurnal.')
+        else:
+            if not state['complete']:
+                self.log_buffer.add(
+                    logging.ERROR,
+                    'Planul din jurnal nu este complet (rulare în mod streaming întreruptă); porniți o rulare nouă.')
+                return
+            self.journal.reopen(len(ops), state['valid_size'])
+            plan = [(index, op) for index, op in enumerate(ops) if index not in state['done']]
+            self.log_buffer.add(logging.INFO, f'Reluare: {len(plan)} din {len(ops)} redenumiri rămase în jurnal.')
+        
+        self.total_ops = len(plan)
+        self.plan_ready.emit(self.total_ops, 0)
+        self.apply_plan(plan)
+    
+    def report_conflicts(self, conflicts):
+        for op, reason in conflicts:
+            self.conflicts += 1
+            kind = 'Director' if op.is_dir else 'Fișier'
+            self.log_buffer.add(logging.ERROR,
+                                f'Conflict de nume: {reason} | {kind}: {op.old_path} -> {op.new_name}',
+                                op.root)
+    
+    def apply_plan(self, plan):
+        """
+        Aplică un plan precalculat de perechi (index, operație); conflictele au fost rezolvate
+        la planificare, deci nu se mai verifică existența.
+        """
+        # Anularea parcurge planul invers (părinții înaintea copiilor), deci rămâne secvențială
+        if self.rename_workers > 1 and not self.dry_run and self.action != 'undo':
+            self.apply_plan_parallel(list(plan))
+            return
+        for index, op in plan:
+            self.finish_op(index, self.apply_op(op))
+    
+    def apply_plan_parallel(self, plan):
+        """
+        Aplică planul pe un grup limitat de fire. Unitatea de lucru este folderul părinte al
+        operațiilor (toate redenumirile din el, în ordinea din plan). Fiecare folder așteaptă
+        un contor al folderelor din subarborele său care au operații; când contorul ajunge la
+        zero, conținutul este deja redenumit și folderul poate fi trimis la execuție.
+        Rezultatele sunt raportate în ordinea planului, deci logul și erorile sunt deterministe.
+        """
+        groups = {}
+        for position, (_, op) in enumerate(plan):
+            groups.setdefault(os.path.normpath(op.root), []).append(position)
+        
+        # Cel mai apropiat strămoș care are și el operații în plan
+        parent = {}
+        remaining = dict.fromkeys(groups, 0)
+        for key in groups:
+            ancestor = key
+            while True:
+                up = os.path.dirname(ancestor)
+                if up == ancestor:
+                    ancestor = None
+                    break
+                ancestor = up
+                if ancestor in groups:
+                    break
+            parent[key] = ancestor
+            if ancestor is not None:
+                remaining[ancestor] += 1
+        
+        results = [None] * len(plan)
+        ready = bytearray(len(plan))
+        next_report = 0
+        with ThreadPoolExecutor(max_workers=self.rename_workers) as executor:
+            running = {executor.submit(self.execute_group, plan, positions): key
+                       for key, positions in groups.items() if remaining[key] == 0}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    for position, error in future.result():
+                        results[position] = error
+                        ready[position] = 1
+                    ancestor = parent[key]
+                    if ancestor is not None:
+                        remaining[ancestor] -= 1
+                        if remaining[ancestor] == 0:
+                            running[executor.submit(self.execute_group, plan, groups[ancestor])] = ancestor
+                
+                while next_report < len(plan) and ready[next_report]:
+                    index, op = plan[next_report]
+                    self.finish_op(index, self.report_result(op, results[next_report]))
+                    results[next_report] = None
+                    next_report += 1
+    
+    def execute_group(self, plan, positions):
+        """Rulează pe un fir din grup: doar redenumirile, fără stare comună."""
+        return [(position, self.execute_op(plan[position][1])) for position in positions]
+    
+    def finish_op(self, index, succeeded):
+        if succeeded and self.journal:
+            if self.action == 'undo':
+                self.journal.record_undone(index)
+            else:
+                self.journal.record_done(index)
+        self.ops_applied += 1
+        # Progresul este trimis doar când se schimbă procentul
+        progress = int((self.ops_applied / self.total_ops) * 100)
+        if progress != self.last_progress:
+            self.last_progress = progress
+            self.progress.emit(progress)
+    
+    def apply_op(self, op):
+        """Returnează True dacă redenumirea a reușit."""
+        return self.report_result(op, self.execute_op(op))
+    
+    def execute_op(self, op):
+        """Redenumește și returnează excepția apărută sau None."""
+        try:
+            self.rename(op)
+        except Exception as e:
+            return e
+        return None
+    
+    def rename(self, op):
+        if self.dry_run:
+            return
+        try:
+            os.rename(op.old_path, op.new_path)
+        except FileNotFoundError:
+            # La reluare, ultimele redenumiri pot fi făcute deja fără să fi ajuns în jurnal
+            if self.action == 'run' or os.path.lexists(op.old_path) or not os.path.lexists(op.new_path):
+                raise
+    
+    def report_result(self, op, error):
+        if op.is_dir:
+            return self.report_dir_result(op, error)
+        return self.report_file_result(op, error)
+    
+    def report_file_result(self, op, error):
+        if error is None:
+            self.modified_files += 1
+            prefix = 'Simulare: ' if self.dry_run else 'Redenumit: '
+            self.log_buffer.add(logging.INFO, f'{prefix}{op.old_name} -> {op.new_name}', op.root)
+            return True
+        old_path = op.old_path
+        error_folder = os.path.dirname(old_path)
+        self.log_buffer.add(logging.ERROR, f'Eroare: {error} | Fișier: {old_path} -> {op.new_path}',
+                            error_folder)
+        return False
+    
+    def report_dir_result(self, op, error):
+        if error is None:
+            self.modified_dirs += 1
+            prefix = 'Simulare director: ' if self.dry_run else 'Director redenumit: '
+            self.log_buffer.add(logging.INFO, f'{prefix}{op.old_name} -> {op.new_name}', op.root)
+            return True
+        old_path = op.old_path
+        error_folder = os.path.dirname(old_path)
+        self.log_buffer.add(logging.ERROR, f'Eroare la director: {error} | Director: {old_path} -> {op.new_path}',
+                            error_folder)
+        return False
 
 class DynamicInputGrid(QWidget):
     def __init__(self):
@@ -218,20 +778,50 @@ class App(QWidget):
         self.path_label = QLabel('Niciun director selectat')
         self.browse_button = QPushButton('Alege Director')
         self.start_button = QPushButton('Start')
+        self.resume_button = QPushButton('Reia rularea întreruptă (din jurnal)')
+        self.undo_button = QPushButton('Anulează ultima rulare (din jurnal)')
+        self.streaming_checkbox = QCheckBox('Mod streaming (arbori foarte mari: fără enumerare prealabilă, progres pe foldere)')
+        self.dry_run_checkbox = QCheckBox('Simulare (doar afișează planul, fără redenumiri)')
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 64)
+        self.workers_spin.setValue(DEFAULT_RENAME_WORKERS)
+        self.workers_spin.setToolTip('Folosit la aplicarea planului complet (nu în modul streaming)')
         self.progress_bar = QProgressBar()
-        self.log_text = ClickableTextEdit()
+        self.status_label = QLabel('')
+        # Fereastra de log: randează doar rândurile vizibile din ultimele LOG_VIEW_LINES intrări
+        self.log_model = LogModel()
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.doubleClicked.connect(self.open_log_folder)
+        self.file_log = None
         
         main_layout.addWidget(scroll)
         main_layout.addWidget(self.path_label)
         main_layout.addWidget(self.browse_button)
+        main_layout.addWidget(self.streaming_checkbox)
+        main_layout.addWidget(self.dry_run_checkbox)
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel('Fire redenumire (foldere în paralel):'))
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+        main_layout.addLayout(workers_layout)
         main_layout.addWidget(self.start_button)
+        journal_layout = QHBoxLayout()
+        journal_layout.addWidget(self.resume_button)
+        journal_layout.addWidget(self.undo_button)
+        main_layout.addLayout(journal_layout)
         main_layout.addWidget(self.progress_bar)
-        main_layout.addWidget(self.log_text)
+        main_layout.addWidget(self.status_label)
+        main_layout.addWidget(self.log_view)
         
         self.setLayout(main_layout)
         self.browse_button.clicked.connect(self.browse_folder)
         self.start_button.clicked.connect(self.start_processing)
         self.start_button.setEnabled(False)
+        self.resume_button.clicked.connect(lambda: self.start_from_journal('resume'))
+        self.undo_button.clicked.connect(lambda: self.start_from_journal('undo'))
+        self.update_journal_buttons()
         
         self.setWindowTitle('Multiple Replace')
         self.setGeometry(300, 300, 800, 600)
@@ -243,7 +833,7 @@ class App(QWidget):
                     saved_pairs = json.load(f)
                     self.input_grid.set_replacements(saved_pairs)
         except Exception as e:
-            self.log_text.append(f'Eroare la încărcarea setărilor: {str(e)}')
+            self.log_model.append_text(f'Eroare la încărcarea setărilor: {str(e)}')
     
     def saveSettings(self):
         try:
@@ -256,7 +846,7 @@ class App(QWidget):
             with open(self.settings_file, 'w', encoding='utf-8') as f:
                 json.dump(pairs_to_save, f, ensure_ascii=False, indent=2)
         except Exception as e:
-            self.log_text.append(f'Eroare la salvarea setărilor: {str(e)}')
+            self.log_model.append_text(f'Eroare la salvarea setărilor: {str(e)}')
     
     def closeEvent(self, event: QCloseEvent):
         self.saveSettings()
@@ -272,42 +862,91 @@ class App(QWidget):
         replacements = self.input_grid.get_replacements()
                 
         if not replacements:
-            self.log_text.append('Completează cel puțin o pereche de înlocuire!')
+            self.log_model.append_text('Completează cel puțin o pereche de înlocuire!')
             return
             
-        self.worker = WorkerThread(self.directory, replacements)
+        streaming = self.streaming_checkbox.isChecked()
+        self.dry_run = self.dry_run_checkbox.isChecked()
+        self.prepare_worker(WorkerThread(self.directory, replacements, streaming, self.dry_run,
+                                         rename_workers=self.workers_spin.value()), streaming)
+        
+        self.log_model.append_text("Reguli de înlocuire aplicate:")
+        for i, (from_text, to_text) in enumerate(replacements, 1):
+            self.log_model.append_text(f"{i}. '{from_text}' -> '{to_text}'")
+        self.log_model.append_text("-" * 40)
+        
+        self.worker.start()
+    
+    def start_from_journal(self, action):
+        self.dry_run = False
+        self.prepare_worker(WorkerThread(None, [], action=action,
+                                         rename_workers=self.workers_spin.value()), False)
+        self.worker.start()
+    
+    def prepare_worker(self, worker, streaming):
+        self.worker = worker
         self.worker.progress.connect(self.update_progress)
-        self.worker.log.connect(self.update_log)
+        self.worker.dirs_processed.connect(self.update_dirs_processed)
+        self.worker.plan_ready.connect(self.update_plan_ready)
+        self.worker.log_batch.connect(self.update_log)
         self.worker.finished.connect(self.processing_finished)
         
         self.browse_button.setEnabled(False)
         self.start_button.setEnabled(False)
+        self.resume_button.setEnabled(False)
+        self.undo_button.setEnabled(False)
+        # În modul streaming totalul nu este cunoscut, deci bara de progres este nedeterminată
+        self.progress_bar.setRange(0, 0 if streaming else 100)
         self.progress_bar.setValue(0)
-        self.log_text.clear()
-        
-        self.log_text.append("Reguli de înlocuire aplicate:")
-        for i, (from_text, to_text) in enumerate(replacements, 1):
-            self.log_text.append(f"{i}. '{from_text}' -> '{to_text}'")
-        self.log_text.append("-" * 40)
-        
-        self.worker.start()
+        self.status_label.setText('')
+        self.log_model.clear()
+        self.file_log = start_file_log()
+    
+    def update_journal_buttons(self):
+        has_journal = os.path.exists(JOURNAL_FILE)
+        self.resume_button.setEnabled(has_journal)
+        self.undo_button.setEnabled(has_journal)
     
     def update_progress(self, value):
         self.progress_bar.setValue(value)
     
-    def update_log(self, message):
-        self.log_text.append(message)
+    def update_dirs_processed(self, count):
+        self.status_label.setText(f'Foldere procesate: {count}')
+    
+    def update_plan_ready(self, operations, conflicts):
+        self.status_label.setText(f'Plan: {operations} redenumiri, {conflicts} conflicte de nume')
+    
+    def update_log(self, entries):
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_entries(entries)
+        # Derulează la ultimul mesaj doar dacă utilizatorul nu a derulat în sus
+        if at_bottom:
+            self.log_view.scrollToBottom()
+    
+    def open_log_folder(self, index):
+        folder = index.data(Qt.UserRole)
+        if folder:
+            open_folder(folder)
     
     def processing_finished(self, modified_files, modified_dirs):
         self.browse_button.setEnabled(True)
-        self.start_button.setEnabled(True)
+        self.start_button.setEnabled(bool(getattr(self, 'directory', None)))
+        self.update_journal_buttons()
+        if self.file_log:
+            stop_file_log(self.file_log)
+            self.file_log = None
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(100)
         
-        self.log_text.append("\nRAPORT FINAL:")
-        self.log_text.append("-" * 40)
-        self.log_text.append(f"Fișiere modificate: {modified_files}")
-        self.log_text.append(f"Directoare modificate: {modified_dirs}")
-        self.log_text.append(f"Total elemente modificate: {modified_files + modified_dirs}")
-        self.log_text.append("-" * 40)
+        self.log_model.append_text("")
+        self.log_model.append_text("RAPORT FINAL (SIMULARE):" if self.dry_run else "RAPORT FINAL:")
+        self.log_model.append_text("-" * 40)
+        self.log_model.append_text(f"Fișiere modificate: {modified_files}")
+        self.log_model.append_text(f"Directoare modificate: {modified_dirs}")
+        self.log_model.append_text(f"Total elemente modificate: {modified_files + modified_dirs}")
+        self.log_model.append_text(f"Conflicte de nume (nemodificate): {self.worker.conflicts}")
+        self.log_model.append_text("-" * 40)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
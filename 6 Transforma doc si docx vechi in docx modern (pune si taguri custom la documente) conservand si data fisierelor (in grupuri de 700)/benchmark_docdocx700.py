@@ -0,0 +1,182 @@
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+from PyQt5.QtCore import QWaitCondition
+
+import docdocx700
+
+# Numărul de fișiere generate pentru fiecare configurație rulată implicit
+DEFAULT_CASES = [200, 1000]
+# Cât poate crește timpul față de referință înainte să fie raportat ca regresie
+DEFAULT_TOLERANCE = 0.25
+
+def generate_files(root, count, doc_ratio, seed=0):
+    """
+    Generează `count` fișiere .doc/.docx mici cu date aleatoare, împărțite în subfoldere.
+    Returnează dicționarul cale finală (.docx) -> data de modificare așteptată după conversie.
+    """
+    rnd = random.Random(seed)
+    expected = {}
+    for index in range(count):
+        folder = os.path.join(root, f"folder_{index % 10}")
+        os.makedirs(folder, exist_ok=True)
+        extension = '.doc' if rnd.random() < doc_ratio else '.docx'
+        file_path = os.path.join(folder, f"document_{index}{extension}")
+        with open(file_path, 'wb') as f:
+            f.write(os.urandom(rnd.randint(64, 4096)))
+        file_time = rnd.uniform(946684800, 1700000000)
+        os.utime(file_path, (file_time, file_time))
+        expected[os.path.splitext(file_path)[0] + '.docx'] = os.stat(file_path).st_mtime
+    return expected
+
+def count_timestamp_mismatches(expected):
+    """Numără documentele .docx a căror dată de modificare nu a fost păstrată."""
+    mismatches = 0
+    for path, mtime in expected.items():
+        try:
+            if os.stat(path).st_mtime != mtime:
+                mismatches += 1
+        except FileNotFoundError:
+            pass
+    return mismatches
+
+def benchmark_case(base_dir, count, args, keep=False):
+    root = os.path.join(base_dir, f"documente_{count}")
+    shutil.rmtree(root, ignore_errors=True)
+    expected = generate_files(root, count, args.doc_ratio, args.seed)
+    files = []
+    for folder, _, names in os.walk(root):
+        files.extend(os.path.join(folder, name) for name in names)
+
+    backend = docdocx700.SimulatedBackend(
+        latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate,
+        hang_rate=args.hang_rate, hang_seconds=args.hang_seconds,
+        start_latency=args.start_latency, modern_ratio=args.modern_ratio, seed=args.seed)
+    task = docdocx700.ConversionTask(files, docdocx700.WorkerSignals(), [False], QWaitCondition(),
+                                     "Company", "Author", backend=backend)
+    task.BATCH_SIZE = args.batch_size
+    task.SLOW_FILE_SECONDS = args.slow_seconds
+
+    # Mesajele per fișier ale ConversionTask sunt ascunse, ca să nu domine timpul măsurat
+    output = sys.stdout if args.verbose else open(os.devnull, 'w')
+    try:
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            task.run()
+        wall_time = time.perf_counter() - start_time
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    mismatches = count_timestamp_mismatches(expected)
+    if not keep:
+        shutil.rmtree(root, ignore_errors=True)
+    stats = task.stats
+    overhead = wall_time - backend.busy_seconds
+    # Fișierele la care planificatorul nu a ajuns nu trebuie să umfle debitul raportat
+    processed = stats['success'] + stats['errors'] + stats['skipped']
+    return {
+        'case': str(count),
+        'files': count,
+        'processed': processed,
+        'dropped': count - processed,
+        'wall_seconds': round(wall_time, 3),
+        'files_per_second': round(processed / wall_time) if wall_time else None,
+        'backend_seconds': round(backend.busy_seconds, 3),
+        'overhead_ms_per_file': round(overhead * 1000 / max(count, 1), 3),
+        'batches': backend.calls['start'],
+        'success': stats['success'],
+        'errors': stats['errors'],
+        'skipped': stats['skipped'],
+        'hangs': backend.calls['hangs'],
+        'leaked_documents': backend.open_documents,
+        'timestamp_mismatches': mismatches,
+    }
+
+def find_regressions(results, baseline, tolerance):
+    """Compară rezultatele cu o rulare anterioară salvată și returnează lista regresiilor."""
+    previous = {item['case']: item for item in baseline}
+    regressions = []
+    for item in results:
+        # Fișierele neprocesate sunt o regresie și fără o rulare de referință
+        if item['dropped'] > 0:
+            regressions.append(f"{item['case']}: fișiere neprocesate {item['dropped']} din {item['files']}")
+        old = previous.get(item['case'])
+        if not old:
+            continue
+        if item['wall_seconds'] > old['wall_seconds'] * (1 + tolerance):
+            regressions.append(f"{item['case']}: timp {old['wall_seconds']}s -> {item['wall_seconds']}s")
+        if item['overhead_ms_per_file'] > old['overhead_ms_per_file'] * (1 + tolerance):
+            regressions.append(f"{item['case']}: cost propriu {old['overhead_ms_per_file']}ms/fișier "
+                               f"-> {item['overhead_ms_per_file']}ms/fișier")
+        if item['timestamp_mismatches'] > old['timestamp_mismatches']:
+            regressions.append(f"{item['case']}: date nepăstrate {old['timestamp_mismatches']} "
+                               f"-> {item['timestamp_mismatches']}")
+        if item['leaked_documents'] > old['leaked_documents']:
+            regressions.append(f"{item['case']}: documente neînchise {old['leaked_documents']} "
+                               f"-> {item['leaked_documents']}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark pentru planificatorul din docdocx700.py, cu backend-ul simulat în locul lui Word.")
+    parser.add_argument('--files', action='append', type=int,
+                        help="numărul de fișiere generate (se poate repeta), ex. 5000")
+    parser.add_argument('--doc-ratio', type=float, default=0.5, help="proporția fișierelor .doc")
+    parser.add_argument('--modern-ratio', type=float, default=0.5,
+                        help="proporția fișierelor .docx deja în format modern")
+    parser.add_argument('--latency', type=float, default=0.0, help="secunde per document")
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--start-latency', type=float, default=0.0, help="secunde pentru pornirea unui lot")
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--hang-rate', type=float, default=0.0)
+    parser.add_argument('--hang-seconds', type=float, default=5.0)
+    parser.add_argument('--batch-size', type=int, default=700)
+    parser.add_argument('--slow-seconds', type=float, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dir', help="folderul în care se generează fișierele (implicit: temporar)")
+    parser.add_argument('--keep', action='store_true',
+                        help="nu șterge fișierele generate")
+    parser.add_argument('--verbose', action='store_true', help="afișează mesajele ConversionTask")
+    parser.add_argument('--output', help="salvează rezultatele JSON în acest fișier")
+    parser.add_argument('--baseline', help="rezultate JSON anterioare pentru detectarea regresiilor")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    base_dir = args.dir or tempfile.mkdtemp(prefix="docdocx700_bench_")
+    os.makedirs(base_dir, exist_ok=True)
+    results = []
+    try:
+        for count in args.files or DEFAULT_CASES:
+            result = benchmark_case(base_dir, count, args, args.keep)
+            results.append(result)
+            print(f"{result['case']:>8} fișiere: {result['processed']} procesate, {result['wall_seconds']}s, "
+                  f"{result['files_per_second']} fișiere/s, {result['overhead_ms_per_file']} ms/fișier cost propriu, "
+                  f"{result['batches']} loturi, {result['errors']} erori")
+    finally:
+        if not args.dir and not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    else:
+        baseline = []
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESIE: {message}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,13 +4,13 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QVBoxLayout
                            QWidget, QFileDialog, QLabel, QProgressBar, QMessageBox,
                            QHBoxLayout, QLineEdit, QGroupBox, QFormLayout)
 from PyQt5.QtCore import QThreadPool, QRunnable, pyqtSignal, QObject, Qt, QMutex, QWaitCondition
-import win32com.client
-import pythoncom
 import time
 import logging
 from datetime import datetime
 import re
 import gc
+import random
+from abc import ABC, abstractmethod
 
 # Configurare logging
 logging.basicConfig(
@@ -23,13 +23,270 @@ logging.basicConfig(
 )
 
 def normalize_path(path):
-    """Normalizează calea pentru Windows"""
-    normalized = os.path.abspath(path).replace('/', '\\')
+    """Normalizează calea cu separatorii sistemului (\\ pe Windows)"""
+    normalized = os.path.normpath(os.path.abspath(path))
     if not os.path.exists(normalized):
         logging.error(f"Path does not exist: {normalized}")
         return None
     return normalized
 
+class ConverterBackend(ABC):
+    """
+    Interfața motorului de conversie folosit de ConversionTask. Loturile, pauza, păstrarea
+    datelor fișierelor și statisticile rămân în ConversionTask; backend-ul doar deschide,
+    convertește și salvează documentele. Un backend căruia îi lipsește o metodă abstractă
+    nu poate fi creat.
+    """
+    name = "backend"
+
+    def initialize(self):
+        """Pregătește thread-ul curent, o singură dată înainte de primul lot"""
+
+    def shutdown(self):
+        """Eliberează resursele thread-ului după ultimul lot"""
+
+    @abstractmethod
+    def start(self):
+        """Pornește o instanță nouă a aplicației (câte una pentru fiecare lot)"""
+
+    @abstractmethod
+    def quit(self):
+        """Închide normal instanța pornită de start()"""
+
+    def cleanup(self):
+        """Închide forțat instanța după o eroare; nu trebuie să arunce excepții"""
+        self.quit()
+
+    @abstractmethod
+    def open(self, file_path):
+        """Deschide documentul și returnează un obiect folosit la apelurile următoare"""
+
+    @abstractmethod
+    def compatibility_mode(self, doc):
+        """Modul de compatibilitate al documentului (15 sau 16 = format modern)"""
+
+    @abstractmethod
+    def convert(self, doc):
+        """Convertește documentul deschis la formatul modern"""
+
+    @abstractmethod
+    def set_properties(self, doc, properties):
+        """Setează proprietățile documentului (dicționar nume -> valoare)"""
+
+    @abstractmethod
+    def save(self, doc):
+        """Salvează documentul peste fișierul din care a fost deschis"""
+
+    @abstractmethod
+    def save_as(self, doc, output_path):
+        """Salvează documentul ca .docx modern la output_path"""
+
+    @abstractmethod
+    def close(self, doc):
+        """Închide documentul după salvare"""
+
+    @abstractmethod
+    def discard(self, doc):
+        """Închide documentul fără să salveze modificările"""
+
+class WordComBackend(ConverterBackend):
+    """Microsoft Word prin COM; win32com și pythoncom sunt importate doar la inițializare"""
+    name = "Word"
+
+    def __init__(self):
+        self.word_app = None
+        self.pythoncom = None
+
+    def kill_word_processes(self):
+        try:
+            os.system('taskkill /f /im WINWORD.EXE >nul 2>&1')
+        except:
+            pass
+
+    def initialize(self):
+        self.kill_word_processes()
+        print("Cleaned up any existing Word processes")
+        time.sleep(2)
+        import pythoncom
+        self.pythoncom = pythoncom
+        pythoncom.CoInitialize()
+
+    def shutdown(self):
+        gc.collect()
+        if self.pythoncom:
+            self.pythoncom.CoUninitialize()
+            self.pythoncom = None
+        time.sleep(1)
+
+    def start(self):
+        import win32com.client
+        print("\nInitializing Word...")
+        self.word_app = win32com.client.Dispatch("Word.Application")
+        self.word_app.Visible = False
+        self.word_app.DisplayAlerts = False
+        print("Word initialized successfully")
+
+    def quit(self):
+        try:
+            print("\nClosing Word application...")
+            self.word_app.Quit()
+            print("Word closed successfully")
+        except:
+            print("Error closing Word")
+        self.word_app = None
+        gc.collect()
+
+    def cleanup(self):
+        """Curăță complet instanța Word și obiectele COM asociate"""
+        try:
+            if self.word_app:
+                print("\nCleaning up Word instance...")
+                try:
+                    for doc in self.word_app.Documents:
+                        try:
+                            doc.Close(SaveChanges=False)
+                        except:
+                            pass
+                    self.word_app.Quit()
+                except:
+                    pass
+                self.kill_word_processes()
+                self.word_app = None
+                gc.collect()
+                print("Word cleanup completed")
+        except Exception as e:
+            print(f"Error during Word cleanup: {str(e)}")
+
+    def open(self, file_path):
+        return self.word_app.Documents.Open(file_path)
+
+    def compatibility_mode(self, doc):
+        return doc.CompatibilityMode
+
+    def convert(self, doc):
+        try:
+            doc.Convert()
+            print("Convert() successful")
+        except:
+            doc.ConvertTo2013()
+            print("ConvertTo2013() successful")
+
+    def set_properties(self, doc, properties):
+        for name, value in properties.items():
+            doc.BuiltInDocumentProperties(name).Value = value
+
+    def save(self, doc):
+        doc.Save()
+
+    def save_as(self, doc, output_path):
+        doc.SaveAs2(output_path, FileFormat=16, CompatibilityMode=15)
+
+    def close(self, doc):
+        doc.Close()
+
+    def discard(self, doc):
+        doc.Close(SaveChanges=False)
+
+class SimulatedBackendError(Exception):
+    """Eroare produsă intenționat de SimulatedBackend"""
+
+class SimulatedDocument:
+    """Document deschis de SimulatedBackend: conținutul fișierului și modul de compatibilitate"""
+    __slots__ = ('path', 'content', 'mode', 'properties')
+
+    def __init__(self, path, content, mode):
+        self.path = path
+        self.content = content
+        self.mode = mode
+        self.properties = {}
+
+class SimulatedBackend(ConverterBackend):
+    """
+    Înlocuitor pur Python pentru Word, pentru teste și benchmark pe orice sistem. Copiază
+    conținutul fișierelor în loc să-l convertească. Fiecare deschidere durează `latency`
+    (± `jitter`) secunde, eșuează cu probabilitatea `failure_rate` sau se blochează
+    `hang_seconds` secunde cu probabilitatea `hang_rate`, apoi continuă normal.
+    """
+    name = "Simulated"
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, hang_rate=0.0, hang_seconds=5.0,
+                 start_latency=0.0, modern_ratio=0.5, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.start_latency = start_latency
+        self.modern_ratio = modern_ratio
+        self.random = random.Random(seed)
+        self.running = False
+        self.open_documents = 0
+        self.busy_seconds = 0.0
+        self.calls = {'start': 0, 'open': 0, 'convert': 0, 'save': 0, 'failures': 0, 'hangs': 0}
+
+    def delay(self, seconds):
+        """Latența simulată; busy_seconds adună timpul petrecut „în Word”"""
+        if seconds > 0:
+            time.sleep(seconds)
+            self.busy_seconds += seconds
+
+    def start(self):
+        self.calls['start'] += 1
+        self.delay(self.start_latency)
+        self.running = True
+
+    def quit(self):
+        self.running = False
+
+    def cleanup(self):
+        self.running = False
+
+    def open(self, file_path):
+        if not self.running:
+            raise SimulatedBackendError("Application not started")
+        self.calls['open'] += 1
+        self.delay(self.latency + self.random.uniform(-self.jitter, self.jitter))
+        roll = self.random.random()
+        if roll < self.failure_rate:
+            self.calls['failures'] += 1
+            raise SimulatedBackendError(f"Simulated failure opening {file_path}")
+        if roll < self.failure_rate + self.hang_rate:
+            self.calls['hangs'] += 1
+            self.delay(self.hang_seconds)
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        if file_path.lower().endswith('.doc'):
+            mode = 11
+        else:
+            mode = 15 if self.random.random() < self.modern_ratio else 14
+        self.open_documents += 1
+        return SimulatedDocument(file_path, content, mode)
+
+    def compatibility_mode(self, doc):
+        return doc.mode
+
+    def convert(self, doc):
+        self.calls['convert'] += 1
+        doc.mode = 15
+
+    def set_properties(self, doc, properties):
+        doc.properties.update(properties)
+
+    def save(self, doc):
+        self.save_as(doc, doc.path)
+
+    def save_as(self, doc, output_path):
+        self.calls['save'] += 1
+        with open(output_path, 'wb') as f:
+            f.write(doc.content)
+        doc.path = output_path
+
+    def close(self, doc):
+        self.open_documents -= 1
+
+    def discard(self, doc):
+        self.open_documents -= 1
+
 class WorkerSignals(QObject):
     """Semnale pentru comunicare între thread-uri"""
     progress = pyqtSignal(int)
@@ -40,15 +297,19 @@ class WorkerSignals(QObject):
 
 class ConversionTask(QRunnable):
     """Task pentru conversia documentelor"""
-    def __init__(self, files, signals, pause_flag, pause_condition, company_tag, author_tag):
+    def __init__(self, files, signals, pause_flag, pause_condition, company_tag, author_tag, backend=None):
         super(ConversionTask, self).__init__()
         self.files = files
+        self.backend = backend if backend is not None else WordComBackend()
         self.signals = signals
         self.pause_flag = pause_flag
         self.pause_condition = pause_condition
         self.company_tag = company_tag
         self.author_tag = author_tag
         self.BATCH_SIZE = 700
+        # Un fișier este lent peste SLOW_FILE_SECONDS; după SLOW_FILES_LIMIT consecutive se începe un lot nou
+        self.SLOW_FILE_SECONDS = 3
+        self.SLOW_FILES_LIMIT = 3
         self.stats = {
             "success": 0,
             "errors": 0,
@@ -62,35 +323,6 @@ class ConversionTask(QRunnable):
             "total_pause_time": 0
         }
 
-    def cleanup_word(self, word_app):
-        """Curăță complet instanța Word și obiectele COM asociate"""
-        try:
-            if word_app:
-                print("\nCleaning up Word instance...")
-                try:
-                    for doc in word_app.Documents:
-                        try:
-                            doc.Close(SaveChanges=False)
-                        except:
-                            pass
-                    word_app.Quit()
-                except:
-                    pass
-                try:
-                    import os
-                    os.system('taskkill /f /im WINWORD.EXE >nul 2>&1')
-                except:
-                    pass
-                try:
-                    del word_app
-                except:
-                    pass
-                gc.collect()
-                print("Word cleanup completed")
-        except Exception as e:
-            print(f"Error during Word cleanup: {str(e)}")
-            pass
-
     def handle_pause(self, index):
         """Gestionează starea de pauză"""
         self.stats["pause_start"] = time.time()
@@ -120,9 +352,9 @@ class ConversionTask(QRunnable):
         print("="*30)
 
     def normalize_path(self, path):
-        """Normalizează calea pentru Windows și verifică existența fișierului"""
+        """Normalizează calea (separatorii sistemului) și verifică existența fișierului"""
         try:
-            normalized = os.path.abspath(path).replace('/', '\\')
+            normalized = os.path.normpath(os.path.abspath(path))
             if not os.path.exists(normalized):
                 print(f"Warning: File not found: {normalized}")
                 return None
@@ -135,8 +367,7 @@ class ConversionTask(QRunnable):
         """Setează proprietățile documentului"""
         try:
             print("Setting document properties...")
-            doc.BuiltInDocumentProperties("Company").Value = self.company_tag
-            doc.BuiltInDocumentProperties("Author").Value = self.author_tag
+            self.backend.set_properties(doc, {"Company": self.company_tag, "Author": self.author_tag})
             print("Document properties set successfully")
             return True
         except Exception as e:
@@ -161,7 +392,7 @@ class ConversionTask(QRunnable):
             print(f"Error preserving file dates: {str(e)}")
             return False
 
-    def process_file(self, file_path, word_app):
+    def process_file(self, file_path):
         """Procesează un singur fișier"""
         original_timestamps = None
         doc = None
@@ -175,7 +406,7 @@ class ConversionTask(QRunnable):
                       f"Modified: {datetime.fromtimestamp(original_timestamps[1])}")
             
             # Deschide documentul
-            doc = word_app.Documents.Open(file_path)
+            doc = self.backend.open(file_path)
             is_doc = file_path.lower().endswith('.doc')
             
             # Determină calea pentru fișierul nou
@@ -184,7 +415,7 @@ class ConversionTask(QRunnable):
             needs_conversion = True
             if not is_doc:
                 try:
-                    initial_mode = doc.CompatibilityMode
+                    initial_mode = self.backend.compatibility_mode(doc)
                     print(f"Initial compatibility mode: {initial_mode}")
                     
                     if initial_mode == 15 or initial_mode == 16:
@@ -192,8 +423,8 @@ class ConversionTask(QRunnable):
                         print("Document is already in modern format, updating properties only")
                         self.stats["docx_modern"] += 1
                         self.set_document_properties(doc)
-                        doc.Save()
-                        doc.Close()
+                        self.backend.save(doc)
+                        self.backend.close(doc)
                         
                         # Restaurăm timestamp-urile originale după salvare
                         if original_timestamps:
@@ -218,21 +449,16 @@ class ConversionTask(QRunnable):
                 print("Converting document format...")
                 # Încearcă conversia
                 try:
-                    doc.Convert()
-                    print("Convert() successful")
-                except:
-                    try:
-                        doc.ConvertTo2013()
-                        print("ConvertTo2013() successful")
-                    except Exception as conv_err:
-                        print(f"Conversion attempt failed: {str(conv_err)}")
+                    self.backend.convert(doc)
+                except Exception as conv_err:
+                    print(f"Conversion attempt failed: {str(conv_err)}")
 
                 # Setăm proprietățile documentului
                 self.set_document_properties(doc)
 
                 # Salvează documentul
-                doc.SaveAs2(output_path, FileFormat=16, CompatibilityMode=15)
-                doc.Close()
+                self.backend.save_as(doc, output_path)
+                self.backend.close(doc)
                 print("Document saved with new format and properties")
 
                 # Restaurează timestamp-urile originale
@@ -256,7 +482,7 @@ class ConversionTask(QRunnable):
             print(f"Error processing file {file_path}: {str(e)}")
             if doc:
                 try:
-                    doc.Close(SaveChanges=False)
+                    self.backend.discard(doc)
                 except:
                     pass
             return False
@@ -265,33 +491,34 @@ class ConversionTask(QRunnable):
         """Execută conversia"""
         print("\n=== Starting Conversion Process ===")
         print(f"Total files to process: {len(self.files)}")
+        print(f"Converter backend: {self.backend.name}")
         
         try:
-            os.system('taskkill /f /im WINWORD.EXE >nul 2>&1')
-            print("Cleaned up any existing Word processes")
-            time.sleep(2)
-        except:
-            pass
+            self.backend.initialize()
+        except Exception as e:
+            print(f"Error initializing {self.backend.name} backend: {str(e)}")
+            self.signals.error.emit(f"Could not initialize {self.backend.name}: {str(e)}")
+            self.stats["execution_time"] = 0
+            self.signals.finished.emit(self.stats)
+            return
 
         self.stats["start_time"] = time.time()
-        pythoncom.CoInitialize()
-        word_app = None
+        started = False
         current_batch = 0
         slow_files_count = 0
         
         try:
             # Împărțim fișierele în loturi
-            for batch_start in range(0, len(self.files), self.BATCH_SIZE):
+            batch_start = 0
+            while batch_start < len(self.files):
                 batch_end = min(batch_start + self.BATCH_SIZE, len(self.files))
+                next_start = batch_end
                 current_batch += 1
                 print(f"\n=== Processing batch {current_batch} ===")
                 
                 # Inițializăm o nouă instanță Word pentru fiecare lot
-                print("\nInitializing Word...")
-                word_app = win32com.client.Dispatch("Word.Application")
-                word_app.Visible = False
-                word_app.DisplayAlerts = False
-                print("Word initialized successfully")
+                self.backend.start()
+                started = True
                 
                 for index in range(batch_start, batch_end):
                     file_start_time = time.time()
@@ -321,7 +548,7 @@ class ConversionTask(QRunnable):
                         self.stats["skipped"] += 1
                         continue
 
-                    success = self.process_file(normalized_path, word_app)
+                    success = self.process_file(normalized_path)
                     
                     if success:
                         self.stats["success"] += 1
@@ -335,37 +562,30 @@ class ConversionTask(QRunnable):
                     processing_time = time.time() - file_start_time
                     print(f"File processing time: {processing_time:.2f} seconds")
 
-                    if processing_time > 3:
+                    if processing_time > self.SLOW_FILE_SECONDS:
                         slow_files_count += 1
                         print(f"Slow processing detected ({slow_files_count} consecutive slow files)")
                     else:
                         slow_files_count = 0
 
-                    if slow_files_count >= 3:
+                    if slow_files_count >= self.SLOW_FILES_LIMIT:
                         print("\nDetected slow processing, forcing new batch...")
+                        # Lotul nou continuă cu fișierul următor, fără să sară peste restul lotului curent
+                        next_start = index + 1
                         break
 
                 print(f"\nBatch {current_batch} completed, cleaning up...")
-                try:
-                    print("\nClosing Word application...")
-                    word_app.Quit()
-                    print("Word closed successfully")
-                except:
-                    print("Error closing Word")
-                word_app = None
-                gc.collect()
+                self.backend.quit()
+                started = False
                 print(f"Batch cleanup completed")
                 slow_files_count = 0
+                batch_start = next_start
                     
         finally:
             try:
-                if word_app:
-                    self.cleanup_word(word_app)
-                word_app = None
-                gc.collect()
-                pythoncom.CoUninitialize()
-                
-                time.sleep(1)
+                if started:
+                    self.backend.cleanup()
+                self.backend.shutdown()
                 
                 total_time = time.time() - self.stats["start_time"] - self.stats["total_pause_time"]
                 
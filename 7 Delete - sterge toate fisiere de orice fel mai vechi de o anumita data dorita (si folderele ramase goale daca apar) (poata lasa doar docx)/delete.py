@@ -1,7 +1,441 @@
 import sys
 import os
+import time
 import datetime
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit, QFileDialog, QMessageBox, QCheckBox
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit,
+                             QFileDialog, QMessageBox, QCheckBox, QProgressBar, QSpinBox, QPlainTextEdit)
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Extensions kept by the "non-doc/docx" filter
+DOC_EXTENSIONS = ('.doc', '.docx')
+# Default number of threads running os.remove (on a share every call is a network round trip)
+DEFAULT_DELETE_WORKERS = 8
+# Files handed to the unlink pool at once; cancel is checked between batches
+DELETE_BATCH_SIZE = 500
+# Seconds between progress updates sent to the window
+PROGRESS_INTERVAL = 0.25
+# Number of error messages kept for the final summary
+MAX_REPORTED_ERRORS = 20
+# Folder inside the selected directory that receives quarantined files; scans always skip it
+QUARANTINE_DIR = ".cleaner_quarantine"
+# Each quarantine run goes into a subfolder named after its start time
+QUARANTINE_BATCH_FORMAT = "%Y%m%d-%H%M%S-%f"
+# Default number of days a quarantine run is kept before the background purge removes it
+DEFAULT_RETENTION_DAYS = 30
+# Background purge throttling (stands in for low I/O priority): pause after every chunk of entries
+PURGE_CHUNK = 200
+PURGE_PAUSE = 0.05
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def remove_file(path):
+    """Runs on a pool thread; returns the error instead of raising it."""
+    try:
+        os.remove(path)
+    except OSError as e:
+        return e
+    return None
+
+def move_entry(source, target):
+    """Runs on a pool thread; a rename within the same volume, error returned instead of raised."""
+    try:
+        os.rename(source, target)
+    except OSError as e:
+        return e
+    return None
+
+def quarantine_path(directory):
+    return os.path.join(directory, QUARANTINE_DIR)
+
+def throttled_rmtree(path, cancel_event=None):
+    """Removes a tree bottom-up, pausing regularly so the purge does not compete with the user's I/O."""
+    removed = 0
+    for root, dirs, files in os.walk(path, topdown=False):
+        dir_names = set(dirs)
+        for name in files + dirs:
+            entry_path = os.path.join(root, name)
+            try:
+                if name in dir_names and not os.path.islink(entry_path):
+                    os.rmdir(entry_path)
+                else:
+                    os.remove(entry_path)
+            except OSError:
+                pass
+            removed += 1
+            if removed % PURGE_CHUNK == 0:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                time.sleep(PURGE_PAUSE)
+    try:
+        os.rmdir(path)
+    except OSError:
+        return False
+    return True
+
+def purge_quarantine(directory, retention_days, cancel_event=None, now=None):
+    """Removes the quarantine runs older than `retention_days`; returns how many were removed."""
+    root = quarantine_path(directory)
+    if not os.path.isdir(root):
+        return 0
+    limit = (now or datetime.datetime.now()) - datetime.timedelta(days=retention_days)
+    removed = 0
+    for name in sorted(os.listdir(root)):
+        try:
+            created = datetime.datetime.strptime(name, QUARANTINE_BATCH_FORMAT)
+        except ValueError:
+            continue
+        if created > limit:
+            continue
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        if throttled_rmtree(os.path.join(root, name), cancel_event):
+            removed += 1
+    return removed
+
+class DirState:
+    """
+    A scanned directory: subfolders still to visit, entries still present and the files
+    matched for deletion, as (path, size, mtime).
+    """
+    __slots__ = ('path', 'parent', 'remaining', 'subdirs', 'files')
+
+    def __init__(self, path, parent):
+        self.path = path
+        self.parent = parent
+        self.remaining = 0
+        self.subdirs = []
+        self.files = []
+
+def should_delete(entry, stat_result, cutoff, keep_extensions):
+    """Date and extension predicates together, using the stat data from scandir."""
+    if keep_extensions is not None and not entry.name.lower().endswith(keep_extensions):
+        return True
+    return stat_result.st_mtime < cutoff
+
+def file_year(mtime):
+    try:
+        return str(datetime.datetime.fromtimestamp(mtime).year)
+    except (OverflowError, OSError, ValueError):
+        return "unknown"
+
+class CleanupPlan:
+    """
+    The result of a scan without deleting anything: directories in post-order (each after
+    its whole subtree), with the files matched in each. The delete phase can run it as is,
+    without scanning the tree again.
+    """
+    def __init__(self, directory, cutoff, keep_extensions):
+        self.directory = directory
+        self.cutoff = cutoff
+        self.keep_extensions = keep_extensions
+        self.dirs = []
+        self.cancelled = False
+
+    def matches(self, directory, cutoff, keep_extensions):
+        return (not self.cancelled and self.directory == directory
+                and self.cutoff == cutoff and self.keep_extensions == keep_extensions)
+
+    def summary(self):
+        """Counts, bytes and breakdowns by year and extension of what the delete phase would do."""
+        summary = {'dirs_scanned': len(self.dirs), 'files': 0, 'bytes': 0, 'dirs': 0,
+                   'by_year': {}, 'by_extension': {}, 'cancelled': self.cancelled}
+        # Same emptiness rule as the delete phase, simulated on a copy of the counts
+        left = {}
+        for state in self.dirs:
+            for path, size, mtime in state.files:
+                summary['files'] += 1
+                summary['bytes'] += size
+                for key, breakdown in ((file_year(mtime), summary['by_year']),
+                                       (os.path.splitext(path)[1].lower() or "(none)", summary['by_extension'])):
+                    counts = breakdown.setdefault(key, [0, 0])
+                    counts[0] += 1
+                    counts[1] += size
+            remaining = left.pop(state, 0) + state.remaining - len(state.files)
+            if remaining == 0 and state.parent is not None:
+                summary['dirs'] += 1
+                left[state.parent] = left.get(state.parent, 0) - 1
+        return summary
+
+def format_preview(summary):
+    lines = [f"Files to delete: {summary['files']} ({format_size(summary['bytes'])})",
+             f"Folders to delete: {summary['dirs']}",
+             f"Folders scanned: {summary['dirs_scanned']}"]
+    if summary['cancelled']:
+        lines.append("Preview was cancelled; the numbers are partial.")
+    for title, breakdown in (("By year", summary['by_year']), ("By extension", summary['by_extension'])):
+        lines.append("")
+        lines.append(f"{title}:")
+        for key, (count, size) in sorted(breakdown.items()):
+            lines.append(f"  {key}: {count} files, {format_size(size)}")
+    return "\n".join(lines)
+
+class CleanupEngine:
+    """
+    Single bottom-up pass over the tree. Deletes files modified before `cutoff` (a timestamp)
+    and, when `keep_extensions` is given, every file without one of those extensions.
+    Matching files are queued and removed in batches by a bounded thread pool. Each directory
+    counts the entries it still holds; once its subtree is done and the batches holding its
+    files have run, a directory whose count reached zero is removed (including directories
+    emptied by the extension filter). The selected directory itself is kept.
+    """
+    def __init__(self, cutoff, keep_extensions=None, workers=DEFAULT_DELETE_WORKERS,
+                 batch_size=DELETE_BATCH_SIZE, progress_callback=None, exclude=()):
+        self.cutoff = cutoff
+        self.keep_extensions = keep_extensions
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        # Paths never scanned (the quarantine folder)
+        self.exclude = {os.path.normcase(path) for path in exclude}
+        self.cancel_event = threading.Event()
+        self.stats = {'files_deleted': 0, 'bytes_deleted': 0, 'dirs_deleted': 0, 'errors': 0,
+                      'files_matched': 0, 'bytes_matched': 0, 'cancelled': False, 'seconds': 0.0}
+        self.error_messages = []
+        # Files waiting for the pool: (path, size, directory state)
+        self.batch = []
+        # Finished directories (in post-order) waiting for the batch before the emptiness check
+        self.waiting = []
+        self.executor = None
+        self.last_progress = 0.0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def scan(self, directory, progress=True):
+        """Yields every directory after its whole subtree, with its matched files; deletes nothing."""
+        root = DirState(directory, None)
+        self.scan_directory(root)
+        stack = [root]
+        while stack and not self.cancelled:
+            state = stack[-1]
+            if state.subdirs:
+                child = DirState(state.subdirs.pop(), state)
+                self.scan_directory(child)
+                stack.append(child)
+                continue
+            stack.pop()
+            if progress:
+                self.report_progress(self.stats['files_matched'], self.stats['bytes_matched'])
+            yield state
+
+    def build_plan(self, directory):
+        """Preview: the same scan and predicates, collected into a reusable plan."""
+        plan = CleanupPlan(directory, self.cutoff, self.keep_extensions)
+        plan.dirs.extend(self.scan(directory))
+        plan.cancelled = self.cancelled
+        self.report_progress(self.stats['files_matched'], self.stats['bytes_matched'], force=True)
+        return plan
+
+    def run(self, directory, plan=None):
+        """Deletes while scanning, or runs a plan from build_plan without scanning again."""
+        start_time = time.monotonic()
+        states = plan.dirs if plan is not None else self.scan(directory, progress=False)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            self.executor = executor
+            for state in states:
+                if self.cancelled:
+                    break
+                self.batch.extend((path, size, state) for path, size, _ in state.files)
+                state.files = []
+                self.waiting.append(state)
+                if len(self.batch) >= self.batch_size or len(self.waiting) >= self.batch_size:
+                    self.flush()
+            self.flush()
+        self.stats['cancelled'] = self.cancelled
+        self.stats['seconds'] = time.monotonic() - start_time
+        self.report_progress(self.stats['files_deleted'], self.stats['bytes_deleted'], force=True)
+        return self.stats
+
+    def run_quarantine(self, directory, plan=None):
+        """
+        Fast mode: instead of deleting, moves matches into quarantine_path(directory) on the same
+        volume. A subtree whose entries all match is moved with a single rename of its topmost
+        folder; only the matched files of partially matching folders are moved one by one.
+        """
+        start_time = time.monotonic()
+        if plan is None:
+            plan = self.build_plan(directory)
+        batch_root = os.path.join(quarantine_path(directory),
+                                  datetime.datetime.now().strftime(QUARANTINE_BATCH_FORMAT))
+        self.stats['quarantine'] = batch_root
+
+        # Bottom-up: a folder is complete when every entry in it matches or is a complete folder
+        complete = set()
+        complete_children = {}
+        totals = {}
+        for state in plan.dirs:
+            files, size, dirs = totals.pop(state, (0, 0, 0))
+            files += len(state.files)
+            size += sum(file_size for _, file_size, _ in state.files)
+            if (state.parent is not None
+                    and state.remaining - len(state.files) - complete_children.pop(state, 0) == 0):
+                complete.add(state)
+                complete_children[state.parent] = complete_children.get(state.parent, 0) + 1
+                dirs += 1
+                parent_totals = totals.get(state.parent, (0, 0, 0))
+                totals[state.parent] = (parent_totals[0] + files, parent_totals[1] + size,
+                                        parent_totals[2] + dirs)
+            totals[state] = (files, size, dirs)
+
+        # Moves: (source, size, files, folders); folders inside a complete parent travel with it
+        moves = []
+        for state in plan.dirs:
+            if state.parent in complete:
+                continue
+            if state in complete:
+                files, size, dirs = totals[state]
+                moves.append((state.path, size, files, dirs))
+            else:
+                moves.extend((path, size, 1, 0) for path, size, _ in state.files)
+
+        created = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for start in range(0, len(moves), self.batch_size):
+                if self.cancelled:
+                    break
+                batch = moves[start:start + self.batch_size]
+                targets = []
+                for source, _, _, _ in batch:
+                    target = os.path.join(batch_root, os.path.relpath(source, directory))
+                    parent = os.path.dirname(target)
+                    if parent not in created:
+                        os.makedirs(parent, exist_ok=True)
+                        created.add(parent)
+                    targets.append(target)
+                errors = executor.map(move_entry, [source for source, _, _, _ in batch], targets)
+                for (source, size, files, dirs), error in zip(batch, errors):
+                    if error is None:
+                        self.stats['files_deleted'] += files
+                        self.stats['bytes_deleted'] += size
+                        self.stats['dirs_deleted'] += dirs
+                        self.stats['renames'] = self.stats.get('renames', 0) + 1
+                    else:
+                        self.record_error(f"{source}: {error}")
+                self.report_progress(self.stats['files_deleted'], self.stats['bytes_deleted'])
+        self.stats['cancelled'] = self.cancelled
+        self.stats['seconds'] = time.monotonic() - start_time
+        self.report_progress(self.stats['files_deleted'], self.stats['bytes_deleted'], force=True)
+        return self.stats
+
+    def scan_directory(self, state):
+        """Lists one directory, records its matching files and queues its subfolders."""
+        try:
+            with os.scandir(state.path) as entries:
+                for entry in entries:
+                    state.remaining += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if os.path.normcase(entry.path) not in self.exclude:
+                                state.subdirs.append(entry.path)
+                            continue
+                        if entry.is_symlink() and entry.is_dir():
+                            # A link to a directory: os.walk listed it with the folders and never deleted it
+                            continue
+                        stat_result = entry.stat()
+                        if should_delete(entry, stat_result, self.cutoff, self.keep_extensions):
+                            state.files.append((entry.path, stat_result.st_size, stat_result.st_mtime))
+                            self.stats['files_matched'] += 1
+                            self.stats['bytes_matched'] += stat_result.st_size
+                    except OSError as e:
+                        self.record_error(f"{entry.path}: {e}")
+        except OSError as e:
+            # Unreadable directory: never treat it as empty
+            state.remaining += 1
+            self.record_error(f"{state.path}: {e}")
+
+    def flush(self):
+        """Runs the queued files on the pool batch by batch, then removes the finished directories left empty."""
+        while self.batch and not self.cancelled:
+            batch = self.batch[:self.batch_size]
+            del self.batch[:self.batch_size]
+            errors = self.executor.map(remove_file, [path for path, _, _ in batch])
+            for (path, size, state), error in zip(batch, errors):
+                if error is None:
+                    state.remaining -= 1
+                    self.stats['files_deleted'] += 1
+                    self.stats['bytes_deleted'] += size
+                else:
+                    self.record_error(f"{path}: {error}")
+            self.report_progress(self.stats['files_deleted'], self.stats['bytes_deleted'])
+        if self.cancelled:
+            return
+
+        waiting, self.waiting = self.waiting, []
+        for state in waiting:
+            if state.remaining == 0 and state.parent is not None:
+                try:
+                    os.rmdir(state.path)
+                    state.parent.remaining -= 1
+                    self.stats['dirs_deleted'] += 1
+                except OSError as e:
+                    self.record_error(f"{state.path}: {e}")
+
+    def record_error(self, message):
+        self.stats['errors'] += 1
+        if len(self.error_messages) < MAX_REPORTED_ERRORS:
+            self.error_messages.append(message)
+
+    def report_progress(self, files, size, force=False):
+        now = time.monotonic()
+        if self.progress_callback and (force or now - self.last_progress >= PROGRESS_INTERVAL):
+            self.last_progress = now
+            self.progress_callback(files, size)
+
+class CleanerWorker(QThread):
+    """Runs the cleanup (or the preview scan) off the GUI thread."""
+    progress = pyqtSignal(int, object)  # files deleted (matched in preview), bytes
+    finished = pyqtSignal(dict)         # final stats, or the preview summary
+
+    def __init__(self, directory, cutoff, keep_extensions=None, workers=DEFAULT_DELETE_WORKERS,
+                 preview=False, plan=None, quarantine=False):
+        super().__init__()
+        self.directory = directory
+        self.preview = preview
+        # preview=True: the scan result is kept here for the delete phase
+        self.plan = plan
+        self.quarantine = quarantine
+        self.engine = CleanupEngine(cutoff, keep_extensions, workers,
+                                    progress_callback=self.progress.emit,
+                                    exclude=[quarantine_path(directory)])
+
+    def stop(self):
+        self.engine.cancel()
+
+    def run(self):
+        if self.preview:
+            self.plan = self.engine.build_plan(self.directory)
+            self.finished.emit(self.plan.summary())
+        elif self.quarantine:
+            self.finished.emit(self.engine.run_quarantine(self.directory, self.plan))
+        else:
+            self.finished.emit(self.engine.run(self.directory, self.plan))
+
+class PurgeWorker(QThread):
+    """Background purge of old quarantine runs, throttled so it stays out of the way."""
+    finished = pyqtSignal(int)  # quarantine runs removed
+
+    def __init__(self, directory, retention_days):
+        super().__init__()
+        self.directory = directory
+        self.retention_days = retention_days
+        self.cancel_event = threading.Event()
+
+    def stop(self):
+        self.cancel_event.set()
+
+    def run(self):
+        self.finished.emit(purge_quarantine(self.directory, self.retention_days, self.cancel_event))
 
 class FileCleanerApp(QWidget):
     def __init__(self):
@@ -32,13 +466,63 @@ class FileCleanerApp(QWidget):
         self.delete_non_doc_checkbox = QCheckBox("Delete all non-doc/docx files after initial cleanup")
         layout.addWidget(self.delete_non_doc_checkbox)
 
+        # Quarantine mode
+        self.quarantine_checkbox = QCheckBox(
+            f"Move to quarantine instead of deleting (fast, reversible; folder {QUARANTINE_DIR})")
+        layout.addWidget(self.quarantine_checkbox)
+        retention_layout = QHBoxLayout()
+        retention_layout.addWidget(QLabel("Keep quarantine for (days):"))
+        self.retention_spin = QSpinBox()
+        # At least one day: the purge starts right after a run and must not remove the run just quarantined
+        self.retention_spin.setRange(1, 3650)
+        self.retention_spin.setValue(DEFAULT_RETENTION_DAYS)
+        retention_layout.addWidget(self.retention_spin)
+        retention_layout.addStretch()
+        layout.addLayout(retention_layout)
+
+        # Number of parallel deletions
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Parallel deletions:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 64)
+        self.workers_spin.setValue(DEFAULT_DELETE_WORKERS)
+        workers_layout.addWidget(self.workers_spin)
+        workers_layout.addStretch()
+        layout.addLayout(workers_layout)
+
+        # Preview Button
+        self.preview_button = QPushButton("Preview (dry run)")
+        self.preview_button.clicked.connect(self.start_preview)
+        layout.addWidget(self.preview_button)
+
         # Start Button
         self.start_button = QPushButton("Start Cleaning")
         self.start_button.clicked.connect(self.start_cleaning)
         layout.addWidget(self.start_button)
 
+        # Cancel Button
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_cleaning)
+        self.cancel_button.setEnabled(False)
+        layout.addWidget(self.cancel_button)
+
+        # Progress
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        # Preview report
+        self.report_text = QPlainTextEdit()
+        self.report_text.setReadOnly(True)
+        layout.addWidget(self.report_text)
+
         self.setLayout(layout)
         self.directory_path = ""
+        self.worker = None
+        self.purge_worker = None
+        # Plan from the last preview, reused by "Start Cleaning" if the settings did not change
+        self.plan = None
 
     def browse_directory(self):
         # Opens a dialog to select directory
@@ -46,56 +530,134 @@ class FileCleanerApp(QWidget):
         if directory:
             self.directory_path = directory
             self.path_label.setText(f"Selected Directory: {self.directory_path}")
+            self.start_purge()
 
-    def start_cleaning(self):
-        # Validate inputs
+    def start_purge(self):
+        """Starts the background purge of expired quarantine runs, if there is anything to purge."""
+        if self.purge_worker or not os.path.isdir(quarantine_path(self.directory_path)):
+            return
+        self.purge_worker = PurgeWorker(self.directory_path, self.retention_spin.value())
+        self.purge_worker.finished.connect(self.purge_finished)
+        self.purge_worker.start()
+
+    def purge_finished(self, removed):
+        self.purge_worker = None
+        if removed:
+            self.status_label.setText(f"Purged {removed} expired quarantine run(s).")
+
+    def read_settings(self):
+        """Validates the inputs; returns (cutoff timestamp, kept extensions) or None."""
         date_text = self.date_input.text()
         if not self.directory_path:
             QMessageBox.warning(self, "Warning", "Please select a directory.")
-            return
+            return None
         if not date_text:
             QMessageBox.warning(self, "Warning", "Please enter a date.")
-            return
+            return None
 
         # Parse date
         try:
             target_date = datetime.datetime.strptime(date_text, "%d-%m-%Y")
         except ValueError:
             QMessageBox.warning(self, "Warning", "Invalid date format. Use DD-MM-YYYY.")
+            return None
+
+        keep_extensions = DOC_EXTENSIONS if self.delete_non_doc_checkbox.isChecked() else None
+        return target_date.timestamp(), keep_extensions
+
+    def start_preview(self):
+        settings = self.read_settings()
+        if settings is None:
             return
+        self.plan = None
+        self.report_text.clear()
+        self.start_worker(CleanerWorker(self.directory_path, *settings, self.workers_spin.value(),
+                                        preview=True), "Scanning (nothing is deleted)...")
+
+    def start_cleaning(self):
+        settings = self.read_settings()
+        if settings is None:
+            return
+
+        # One pass: date filter, optional non-doc/docx filter and removal of emptied folders.
+        # A preview made with the same settings is executed directly, without a second scan.
+        plan = self.plan if self.plan and self.plan.matches(self.directory_path, *settings) else None
+        self.plan = None
+        quarantine = self.quarantine_checkbox.isChecked()
+        if quarantine:
+            status = "Moving to quarantine..."
+        else:
+            status = "Deleting the files from the preview..." if plan else "Cleaning..."
+        self.start_worker(CleanerWorker(self.directory_path, *settings, self.workers_spin.value(),
+                                        plan=plan, quarantine=quarantine), status)
+
+    def start_worker(self, worker, status):
+        self.worker = worker
+        self.worker.progress.connect(self.update_progress)
+        self.worker.finished.connect(self.cleaning_finished)
+
+        self.set_running(True)
+        # The total is not known in advance, so the bar only shows activity
+        self.progress_bar.setRange(0, 0)
+        self.status_label.setText(status)
+        self.worker.start()
+
+    def set_running(self, running):
+        self.browse_button.setEnabled(not running)
+        self.preview_button.setEnabled(not running)
+        self.start_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def cancel_cleaning(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling after the current batch...")
+
+    def update_progress(self, files, size):
+        verb = "Matched" if self.worker and self.worker.preview else "Deleted"
+        self.status_label.setText(f"{verb} {files} files ({format_size(size)})")
+
+    def cleaning_finished(self, stats):
+        self.set_running(False)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(100)
+        if self.worker.preview:
+            self.preview_finished(stats)
+            return
+        title = "Cancelled" if stats['cancelled'] else "Completed"
+        verb = "moved to quarantine" if self.worker.quarantine else "deleted"
+        summary = (f"Files {verb}: {stats['files_deleted']} ({format_size(stats['bytes_deleted'])})\n"
+                   f"Folders {verb}: {stats['dirs_deleted']}\n"
+                   f"Errors: {stats['errors']}\n"
+                   f"Time: {stats['seconds']:.1f} s")
+        if self.worker.quarantine:
+            summary += (f"\nRenames: {stats.get('renames', 0)}\n"
+                        f"Quarantine: {stats['quarantine']}\n"
+                        f"(purged automatically after {self.retention_spin.value()} days)")
+        self.status_label.setText(summary.replace("\n", ", "))
+        errors = self.worker.engine.error_messages
+        if errors:
+            summary += "\n\nFirst errors:\n" + "\n".join(errors)
+        message = "Cleaning was cancelled." if stats['cancelled'] else "Cleaning completed successfully."
+        QMessageBox.information(self, title, f"{message}\n\n{summary}")
+        self.worker = None
+        self.start_purge()
+
+    def preview_finished(self, summary):
+        self.plan = self.worker.plan
+        self.worker = None
+        self.report_text.setPlainText(format_preview(summary))
+        self.status_label.setText(
+            f"Preview: {summary['files']} files ({format_size(summary['bytes'])}), "
+            f"{summary['dirs']} folders would be deleted. Nothing was deleted.")
 
-        # Perform initial cleaning based on date
-        self.clean_directory_by_date(self.directory_path, target_date)
-
-        # If checkbox is selected, delete non-doc/docx files in the remaining structure
-        if self.delete_non_doc_checkbox.isChecked():
-            self.delete_non_doc_files(self.directory_path)
-
-        QMessageBox.information(self, "Completed", "Cleaning completed successfully.")
-
-    def clean_directory_by_date(self, directory, target_date):
-        # Traverse and delete files/folders based on date
-        for root, dirs, files in os.walk(directory, topdown=False):
-            # Delete files older than target date
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_modified_time = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-                if file_modified_time < target_date:
-                    os.remove(file_path)
-
-            # Delete empty directories
-            for dir in dirs:
-                dir_path = os.path.join(root, dir)
-                if not os.listdir(dir_path):  # If directory is empty
-                    os.rmdir(dir_path)
-
-    def delete_non_doc_files(self, directory):
-        # Traverse and delete all non-doc/docx files in the directory structure
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if not file.lower().endswith(('.doc', '.docx')):
-                    file_path = os.path.join(root, file)
-                    os.remove(file_path)
+    def closeEvent(self, event):
+        for worker in (self.worker, self.purge_worker):
+            if worker:
+                worker.stop()
+                worker.wait()
+        event.accept()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)